@@ -671,6 +671,9 @@ async def run_listening_export_mode(browser_service: DriverService, ai_service:
 
 async def main():
    """程序主入口，提供模式选择。"""
+   # Python 3.12+：任务创建时先同步执行到第一个真正的等待点，已可立即完成的协程无需再经过一次事件循环调度
+   if hasattr(asyncio, "eager_task_factory"):
+       asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
    # 启动前检查并获取凭据
    if not await handle_credentials():
        logger.error("因凭据配置失败，程序无法继续运行。")
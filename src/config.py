@@ -45,6 +45,7 @@ PROCESS_ONLY_INCOMPLETE_TASKS = os.getenv("PROCESS_ONLY_INCOMPLETE_TASKS", "True
 AUTO_MODE_NO_CONFIRM = os.getenv("AUTO_MODE_NO_CONFIRM", "True").lower() == 'true' # 如果为True，在全自动模式下，程序将不会等待用户确认，自动发送Prompt并提交答案
 FORCE_AI = os.getenv("FORCE_AI", "False").lower() == 'true'  # 如果为True，即使有缓存，也强制使用AI重新回答
 SKIP_SHORT_ANSWER_QUESTIONS = _env_bool("SKIP_SHORT_ANSWER_QUESTIONS", False)  # 如果为True，将跳过文本简答题和语音简答题
+QA_VOICE_CONCURRENCY = max(1, _env_int("QA_VOICE_CONCURRENCY", 3))  # 语音简答题并发提取题目、生成答案的上限；录音阶段始终串行
 
 # --- 运行时状态变量 (由程序动态修改，无需用户配置) ---
 IS_AUTO_MODE = False # 标记当前是否处于全自动模式
@@ -66,6 +67,13 @@ BROWSER_FALLBACK_CHANNELS = [
     for channel in os.getenv("BROWSER_FALLBACK_CHANNELS", "chromium").split(",")
     if channel.strip()
 ]
+# 需要在浏览器中直接拦截的资源类型（逗号分隔，如 "image,font"），默认不拦截。
+# 媒体和样式表不建议拦截：角色扮演依赖音频播放推进对话，可见性判断依赖样式表。
+BLOCKED_RESOURCE_TYPES = {
+    resource_type.strip().lower()
+    for resource_type in os.getenv("BLOCKED_RESOURCE_TYPES", "").split(",")
+    if resource_type.strip()
+}
 
 # --- Resume / task queue cache ---
 REFRESH_TASK_QUEUE = _env_bool("REFRESH_TASK_QUEUE", False)
@@ -75,6 +83,17 @@ TASK_QUEUE_CACHE_FILE = os.getenv("TASK_QUEUE_CACHE_FILE", ".runtime/task_queues
 # --- Listening export mode ---
 LISTENING_EXPORT_FILE = os.getenv("LISTENING_EXPORT_FILE", ".runtime/listening_export.md")
 
+# --- TTS audio cache ---
+TTS_AUDIO_CACHE_DIR = os.getenv("TTS_AUDIO_CACHE_DIR", ".runtime/tts_cache")  # 本地TTS合成结果的磁盘缓存目录，跨运行复用
+TTS_CONCURRENCY = max(1, _env_int("TTS_CONCURRENCY", 4))  # 预生成音频时同时运行的Piper进程上限
+
+# --- AI response cache ---
+AI_RESPONSE_CACHE_ENABLED = _env_bool("AI_RESPONSE_CACHE_ENABLED", True)  # 如果为True，相同Prompt的AI回答会被缓存并在之后直接复用（FORCE_AI为True时不读取）
+AI_RESPONSE_CACHE_FILE = os.getenv("AI_RESPONSE_CACHE_FILE", ".runtime/ai_response_cache.json")
+
+# --- Media transcript cache ---
+TRANSCRIPT_CACHE_FILE = os.getenv("TRANSCRIPT_CACHE_FILE", ".runtime/transcript_cache.json")  # 音视频转写结果按媒体地址持久缓存，跨运行复用
+
 # --- Study time keepalive ---
 STUDY_TIME_REFRESH_INTERVAL_SECONDS = max(60, _env_int("STUDY_TIME_REFRESH_INTERVAL_SECONDS", 600))
 STUDY_TIME_ACTIVITY_INTERVAL_SECONDS = max(5, _env_int("STUDY_TIME_ACTIVITY_INTERVAL_SECONDS", 30))
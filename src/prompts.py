@@ -143,6 +143,8 @@ DROPDOWN_SELECTION_PROMPT = """
 """
 
 # 提示词：处理简答题（Short Answer Questions）
+# 篇幅最长、在“题中题”各子题间共享的文章/听力原文放在说明和子问题之前，使请求前缀尽量一致，
+# 以便命中 DeepSeek 按前缀自动生效的上下文硬盘缓存。
 SHORT_ANSWER_PROMPT = """你是一个用于解答U校园英语题的AI助手。请根据以下提供的上下文信息（包括题目说明、文章或听力原文）和一系列子问题，为每一个子问题生成一个简洁明了的英文回答。
 
 **重要规则：** 如果提供的上下文信息（文章、听力原文等）不足以回答问题，或者上下文为空，请不要直接说明信息不足。相反，你应该利用你的通用知识，围绕“学习”、“个人成长”、“沟通技巧”或“社会观察”等常见教育主题，为问题生成一个听起来合理、具有普遍性的英文回答。你的目标是提供一个有建设性且听起来自然的答案，即使它不是严格基于所提供的上下文。
@@ -159,10 +161,9 @@ JSON格式如下:
 }}
 
 ---
-【题目说明】:
+{article_text}【题目说明】:
 {direction_text}
 
-{article_text}
 【子问题列表】:
 {sub_questions}
 """
@@ -183,11 +184,11 @@ JSON格式如下:
 }}
 
 ---
+{article_text}
+
 【题目说明】:
 {direction_text}
 
-{article_text}
-
 【子问题列表】:
 {sub_questions}
 """
@@ -1,5 +1,6 @@
 # src/services/ai_service.py
 import asyncio
+import functools
 import hashlib
 import json
 import os
@@ -8,6 +9,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import unicodedata
 import uuid  # 新增导入
 import zipfile
@@ -26,6 +28,50 @@ from src.utils import logger
 import warnings
 
 
+# TTS 特殊标点符号替换表，模块加载时构建一次
+_TTS_PUNCTUATION_TABLE = str.maketrans({
+    '—': '-',  # EM DASH
+    '–': '-',  # EN DASH
+    '…': '...',  # HORIZONTAL ELLIPSIS
+    '「': '"',  # LEFT CORNER BRACKET
+    '」': '"',  # RIGHT CORNER BRACKET
+    '『': '"',  # LEFT WHITE CORNER BRACKET
+    '』': '"',  # RIGHT WHITE CORNER BRACKET
+    '《': '"',  # LEFT DOUBLE ANGLE BRACKET
+    '》': '"',  # RIGHT DOUBLE ANGLE BRACKET
+    '〈': "'",  # LEFT ANGLE BRACKET
+    '〉': "'",  # RIGHT ANGLE BRACKET
+    '“': '"',
+    '”': '"',
+    '‘': "'",
+    '’': "'",
+    '`': "'",  # 反引号
+    '´': "'",  # 锐音符
+    '′': "'",  # 分符号
+    '″': '"',  # 秒符号
+})
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_tts_text(text: str) -> str:
+    """按原始文本缓存净化结果，重试和重复出现的句子无需再次规范化。"""
+    # 1. 使用 NFKC 规范化处理兼容性字符（例如全角到半角）；已是规范形式（常见的纯英文句子）时跳过
+    normalized_text = text if unicodedata.is_normalized('NFKC', text) else unicodedata.normalize('NFKC', text)
+
+    # 2. 用预编译的转换表一次性替换特殊标点符号（单次遍历，代替逐个 replace）
+    normalized_text = normalized_text.translate(_TTS_PUNCTUATION_TABLE)
+
+    # 3. 白名单过滤：只保留英文、数字和指定的标点符号
+    # 使用正则表达式移除所有不符合白名单的字符
+    allowed_chars_pattern = r"[^a-zA-Z0-9\s.,?!'\"():;-]"
+    clean_text = re.sub(allowed_chars_pattern, '', normalized_text)
+
+    # 4. 去除多余的空白字符
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+
+    return clean_text
+
+
 class LocalTTSEngine:
     """
     使用Piper TTS的本地文本转语音引擎。
@@ -43,6 +89,11 @@ class LocalTTSEngine:
         # 初始化模型路径
         self.model_path = self.models_dir / f"{self.model_name}.onnx"
         self.model_config_path = self.models_dir / f"{self.model_name}.onnx.json"
+        # 多个合成任务会并发调用 ensure_model_exists，串行化检查与下载，避免首次运行时各任务互删 .part 文件、重复下载到同一路径
+        self._model_lock = asyncio.Lock()
+        # 实际传给 Piper 的 (模型路径, 配置路径)；安装路径含非ASCII字符时为复制到安全目录后的路径，
+        # 在模型就绪后只解析、复制一次，避免并发合成时反复覆盖另一个 Piper 进程正在读取的模型文件
+        self._runtime_model_paths: tuple[Path, Path] | None = None
 
         # 设置安全的 espeak-ng-data 路径
         self.safe_espeak_path = self._setup_safe_espeak_data(self.python_dir)
@@ -121,14 +172,25 @@ class LocalTTSEngine:
             logger.error(f"构建安全数据环境失败: {e}")
             return None
 
-    async def ensure_model_exists(self):
-        """检查并自动下载所需的TTS模型。"""
-        if not self._model_files_look_valid():
-            logger.info(f"📥 首次使用，需要下载Piper TTS模型: {self.model_name}")
-            self._remove_invalid_model_files()
-            await self._download_model()
-        if not self._model_files_look_valid():
-            raise RuntimeError("Piper TTS模型文件校验失败，请检查网络后重试。")
+    async def ensure_model_exists(self) -> tuple[Path, Path]:
+        """检查并自动下载所需的TTS模型，返回实际传给 Piper 的 (模型路径, 配置路径)。"""
+        async with self._model_lock:
+            if self._runtime_model_paths is not None:
+                return self._runtime_model_paths
+            if not self._model_files_look_valid():
+                logger.info(f"📥 首次使用，需要下载Piper TTS模型: {self.model_name}")
+                self._remove_invalid_model_files()
+                await self._download_model()
+            if not self._model_files_look_valid():
+                raise RuntimeError("Piper TTS模型文件校验失败，请检查网络后重试。")
+
+            model_path = copy_to_safe_path(self.model_path, "piper_models")
+            model_config_path = self.model_config_path
+            if model_path != self.model_path:
+                model_config_path = copy_to_safe_path(self.model_config_path, "piper_models")
+                logger.info(f"检测到模型路径包含非ASCII字符，已复制到安全路径: {model_path.parent}")
+            self._runtime_model_paths = (model_path, model_config_path)
+            return self._runtime_model_paths
 
     def _model_files_look_valid(self) -> bool:
         if not self.model_path.exists() or not self.model_config_path.exists():
@@ -269,43 +331,7 @@ class LocalTTSEngine:
         if not isinstance(text, str):
             return ""
 
-        # 1. 使用 NFKC 规范化处理兼容性字符（例如全角到半角）
-        normalized_text = unicodedata.normalize('NFKC', text)
-
-        # 2. 定义一个更全面的特殊标点符号替换表
-        replacements = {
-            '—': '-',  # EM DASH
-            '–': '-',  # EN DASH
-            '…': '...',  # HORIZONTAL ELLIPSIS
-            '「': '"',  # LEFT CORNER BRACKET
-            '」': '"',  # RIGHT CORNER BRACKET
-            '『': '"',  # LEFT WHITE CORNER BRACKET
-            '』': '"',  # RIGHT WHITE CORNER BRACKET
-            '《': '"',  # LEFT DOUBLE ANGLE BRACKET
-            '》': '"',  # RIGHT DOUBLE ANGLE BRACKET
-            '〈': "'",  # LEFT ANGLE BRACKET
-            '〉': "'",  # RIGHT ANGLE BRACKET
-            '“': '"',
-            '”': '"',
-            '‘': "'",
-            '’': "'",
-            '`': "'",  # 反引号
-            '´': "'",  # 锐音符
-            '′': "'",  # 分符号
-            '″': '"',  # 秒符号
-        }
-        for old, new in replacements.items():
-            normalized_text = normalized_text.replace(old, new)
-
-        # 3. 白名单过滤：只保留英文、数字和指定的标点符号
-        # 使用正则表达式移除所有不符合白名单的字符
-        allowed_chars_pattern = r"[^a-zA-Z0-9\s.,?!'\"():;-]"
-        clean_text = re.sub(allowed_chars_pattern, '', normalized_text)
-        
-        # 4. 去除多余的空白字符
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-
-        return clean_text
+        return _clean_tts_text(text)
 
     async def synthesize(self, text: str, length_scale: float = 1.0, noise_scale: float = 0.667, noise_w: float = 0.8) -> bytes | None:
         """
@@ -322,7 +348,8 @@ class LocalTTSEngine:
         output_path = get_safe_temp_dir() / f"piper_output_{uuid.uuid4().hex}.wav"
         
         try:
-            await self.ensure_model_exists()
+            # 配置文件与模型位于同一目录，Piper 会自动读取，这里只需模型路径
+            model_path, _ = await self.ensure_model_exists()
 
             # 检查 piper.exe 是否存在于便携版Python的Scripts目录中
             if not self.piper_exe_path.exists():
@@ -331,12 +358,6 @@ class LocalTTSEngine:
                 logger.error("请确认 'piper-tts' 是否已通过 'run.bat' 脚本正确安装。")
                 return None
 
-            model_path = copy_to_safe_path(self.model_path, "piper_models")
-            model_config_path = self.model_config_path
-            if model_path != self.model_path:
-                model_config_path = copy_to_safe_path(self.model_config_path, "piper_models")
-                logger.info(f"检测到模型路径包含非ASCII字符，已复制到安全路径: {model_path.parent}")
-
             logger.debug(f"正在使用Piper TTS合成语音 (语速: {length_scale}, noise_scale: {noise_scale}, noise_w: {noise_w}): '{clean_text[:30]}...'")
             piper_command = [
                 str(self.piper_exe_path),
@@ -364,7 +385,15 @@ class LocalTTSEngine:
                 env=env # 传入修改后的环境
             )
             
-            _, stderr = await process.communicate(clean_text.encode('utf-8'))
+            try:
+                _, stderr = await process.communicate(clean_text.encode('utf-8'))
+            except asyncio.CancelledError:
+                # 合成任务被取消（如推测生成的重试音频已用不上）时结束 Piper 子进程，
+                # 避免其脱离并发上限继续运行，并确保进程退出后再删除它写入的临时文件
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
             
             if process.returncode == 0 and output_path.exists():
                 with open(output_path, "rb") as f:
@@ -383,9 +412,12 @@ class LocalTTSEngine:
             logger.error(f"Piper TTS 合成失败: {e}")
             return None
         finally:
-            # 确保临时文件被删除
-            if output_path.exists():
-                output_path.unlink()
+            # 确保临时文件被删除；删除失败不应覆盖原本的返回值或异常（包括取消）
+            try:
+                if output_path.exists():
+                    output_path.unlink()
+            except OSError as e:
+                logger.warning(f"删除TTS临时文件失败: {e}")
 			
 
 
@@ -403,6 +435,8 @@ class AIService:
         warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead", category=UserWarning)
         self.whisper_model: Any | None = None
         self.whisper_unavailable_reason: str | None = None
+        # 转写会在多个线程中并发发起（asyncio.to_thread），Whisper 模型的加载与推理需串行执行
+        self._whisper_lock = threading.Lock()
 
         logger.info("正在配置DeepSeek客户端...")
         self.deepseek_client = OpenAI(api_key=config.DEEPSEEK_API_KEY, base_url=config.DEEPSEEK_BASE_URL)
@@ -732,9 +766,10 @@ class AIService:
         """
         logger.info(f"正在进行语音识别: {file_path}")
         try:
-            if not self._ensure_whisper_model():
-                return ""
-            result = self.whisper_model.transcribe(file_path)
+            with self._whisper_lock:
+                if not self._ensure_whisper_model():
+                    return ""
+                result = self.whisper_model.transcribe(file_path)
             text = result.get("text", "")
             logger.info("语音识别完成。")
             return text
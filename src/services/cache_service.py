@@ -1,16 +1,30 @@
 # src/services/cache_service.py
+import hashlib
 import json
 import os
+import src.config as config
 from src.utils import logger
 
 class CacheService:
     """
-    缓存服务类，用于管理AI答案的本地缓存。
-    最终版：放弃哈希，直接按顺序存储答案数组，便于人工编辑。
+    缓存服务类，用于管理AI答案及相关中间结果的本地缓存。
+    答案按顺序存为数组（answers），便于人工编辑；题目顺序可能变化的题型另存一份按题目文本 sha1 索引的
+    question_answers 映射。AI回答与媒体转写分别按 Prompt 和媒体地址的 sha256 索引，TTS 音频按文本与参数的哈希存为文件。
     """
-    def __init__(self, cache_file_path: str = "answer_cache.json"):
+    def __init__(
+        self,
+        cache_file_path: str = "answer_cache.json",
+        audio_cache_dir: str = config.TTS_AUDIO_CACHE_DIR,
+        ai_response_cache_file: str = config.AI_RESPONSE_CACHE_FILE,
+        transcript_cache_file: str = config.TRANSCRIPT_CACHE_FILE,
+    ):
         self.cache_file_path = cache_file_path
+        self.audio_cache_dir = audio_cache_dir
+        self.ai_response_cache_file = ai_response_cache_file
+        self.transcript_cache_file = transcript_cache_file
         self.cache = self._load_cache()
+        self.ai_responses: dict | None = None  # 按Prompt哈希缓存的AI回答，首次使用时才加载
+        self.transcripts: dict | None = None  # 按媒体地址缓存的转写文本，首次使用时才加载
         logger.info(f"缓存服务已初始化，使用文件: {self.cache_file_path}")
 
     def _load_cache(self) -> dict:
@@ -46,7 +60,8 @@ class CacheService:
                 return None
         return current_level
 
-    def save_task_page_answers(self, breadcrumb_parts: list[str], strategy_type: str, answers_list: list[str]):
+    def save_task_page_answers(self, breadcrumb_parts: list[str], strategy_type: str, answers_list: list[str],
+                               question_keys: list[str] | None = None):
         """
         将一个任务页面的所有答案（一个字符串列表）作为一个整体存入缓存。
 
@@ -54,6 +69,8 @@ class CacheService:
             breadcrumb_parts (list[str]): 题目的面包屑路径。
             strategy_type (str): 该页面所有题目的类型。
             answers_list (list[str]): 包含所有答案字符串的列表。
+            question_keys (list[str] | None): 与答案一一对应的题目键（见 make_question_keys），
+                提供且互不重复时额外按题目存储，题目顺序或数量变化时仍可逐题命中。
         """
         current_level = self.cache
         for part in breadcrumb_parts:
@@ -62,10 +79,132 @@ class CacheService:
         # 构建新的、基于数组的缓存结构
         current_level['type'] = strategy_type
         current_level['answers'] = answers_list
+        if (question_keys and len(question_keys) == len(answers_list)
+                and len(set(question_keys)) == len(question_keys)):
+            current_level['question_answers'] = dict(zip(question_keys, answers_list))
+        else:
+            # 无法逐题对应时只保留按顺序的答案，并移除旧的逐题映射，避免读取时旧答案优先命中
+            current_level.pop('question_answers', None)
         
         self._save_cache()
         logger.info(f"页面答案已按顺序整体保存到缓存路径: {' -> '.join(breadcrumb_parts)}")
 
+    @staticmethod
+    def _make_prompt_key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def _load_ai_responses(self) -> dict:
+        if self.ai_responses is None:
+            self.ai_responses = {}
+            if os.path.exists(self.ai_response_cache_file):
+                try:
+                    with open(self.ai_response_cache_file, 'r', encoding='utf-8') as f:
+                        self.ai_responses = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"读取AI回答缓存 {self.ai_response_cache_file} 时出错: {e}。将使用新的空缓存。")
+        return self.ai_responses
+
+    def get_ai_response(self, prompt: str) -> dict | None:
+        """
+        获取相同Prompt此前的AI回答。Prompt包含题干、说明和材料，完全相同即视为同一道题。
+        """
+        return self._load_ai_responses().get(self._make_prompt_key(prompt))
+
+    def save_ai_response(self, prompt: str, response: dict):
+        """缓存一次有效的AI回答。"""
+        responses = self._load_ai_responses()
+        responses[self._make_prompt_key(prompt)] = response
+        try:
+            os.makedirs(os.path.dirname(self.ai_response_cache_file) or ".", exist_ok=True)
+            with open(self.ai_response_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(responses, f, ensure_ascii=False)
+        except IOError as e:
+            logger.error(f"写入AI回答缓存 {self.ai_response_cache_file} 时失败: {e}")
+
+    @staticmethod
+    def _make_media_key(media_url: str) -> str:
+        # 媒体地址可能带签名等会变化的查询参数，只取路径部分
+        path = media_url.split('#')[0].split('?')[0]
+        return hashlib.sha256(path.encode('utf-8')).hexdigest()
+
+    def _load_transcripts(self) -> dict:
+        if self.transcripts is None:
+            self.transcripts = {}
+            if os.path.exists(self.transcript_cache_file):
+                try:
+                    with open(self.transcript_cache_file, 'r', encoding='utf-8') as f:
+                        self.transcripts = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"读取转写缓存 {self.transcript_cache_file} 时出错: {e}。将使用新的空缓存。")
+        return self.transcripts
+
+    def get_transcript(self, media_url: str) -> str | None:
+        """获取此前对同一媒体文件的转写结果。"""
+        return self._load_transcripts().get(self._make_media_key(media_url))
+
+    def save_transcript(self, media_url: str, transcript: str):
+        """缓存一次成功的媒体转写结果。"""
+        transcripts = self._load_transcripts()
+        transcripts[self._make_media_key(media_url)] = transcript
+        try:
+            os.makedirs(os.path.dirname(self.transcript_cache_file) or ".", exist_ok=True)
+            with open(self.transcript_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(transcripts, f, ensure_ascii=False)
+        except IOError as e:
+            logger.error(f"写入转写缓存 {self.transcript_cache_file} 时失败: {e}")
+
+    @staticmethod
+    def make_question_key(question_text: str) -> str:
+        """根据题目全文（题干和选项）生成题目缓存键。"""
+        return hashlib.sha1(question_text.strip().encode('utf-8')).hexdigest()
+
+    @classmethod
+    def make_question_keys(cls, question_texts: list[str]) -> list[str]:
+        """
+        为一页题目生成互不重复的题目键。题干与选项完全相同的题目（如判断题、题干为空的听力题）
+        按出现次序追加序号，避免按题目存储时相互覆盖。
+        """
+        seen: dict[str, int] = {}
+        keys = []
+        for text in question_texts:
+            key = cls.make_question_key(text)
+            occurrence = seen.get(key, 0)
+            seen[key] = occurrence + 1
+            keys.append(key if occurrence == 0 else f"{key}#{occurrence}")
+        return keys
+
+    @staticmethod
+    def make_audio_key(text: str, **tts_params) -> str:
+        """根据文本和TTS参数生成音频缓存键，参数不同（如语速）视为不同的音频。"""
+        raw = json.dumps([text.strip(), sorted(tts_params.items())], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _audio_path(self, key: str) -> str:
+        return os.path.join(self.audio_cache_dir, f"{key}.wav")
+
+    def get_audio(self, key: str) -> bytes | None:
+        """从磁盘读取已缓存的TTS音频，未命中时返回None。"""
+        try:
+            with open(self._audio_path(key), 'rb') as f:
+                return f.read() or None
+        except FileNotFoundError:
+            return None
+        except IOError as e:
+            logger.warning(f"读取音频缓存 {key} 时出错: {e}")
+            return None
+
+    def put_audio(self, key: str, audio_bytes: bytes):
+        """将TTS音频写入磁盘缓存。先写临时文件再替换，避免中断时留下残缺的WAV。"""
+        path = self._audio_path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.audio_cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(audio_bytes)
+            os.replace(tmp_path, path)
+        except IOError as e:
+            logger.warning(f"写入音频缓存 {key} 时失败: {e}")
+
     def clear_cache(self):
         """清除所有缓存。"""
         self.cache = {}
@@ -31,6 +31,8 @@ class DriverService:
         self.browser: Browser | None = None
         self.context: BrowserContext | None = None
         self.page: Page | None = None
+        # 语音题的持久化WebSocket劫持脚本是否已注册为上下文初始化脚本（注册后新文档会自动安装）
+        self.persistent_hijack_registered = False
         logger.info("Playwright驱动服务已初始化（尚未启动）。")
 
     async def start(self, headless=False):
@@ -51,12 +53,23 @@ class DriverService:
         if config.MOCK_MICROPHONE_WHEN_MISSING:
             await self.context.add_init_script(self._build_microphone_fallback_script())
             logger.info("已安装页面级麦克风兜底脚本。")
+        if config.BLOCKED_RESOURCE_TYPES:
+            await self.context.route("**/*", self._route_blocked_resources)
+            logger.info(f"已启用资源拦截，将不加载: {', '.join(sorted(config.BLOCKED_RESOURCE_TYPES))}")
         # await context.tracing.start(screenshots=True, snapshots=True, sources=True)
         self.page = await self.context.new_page()
         # self.page = await self.browser.new_page()
         self.page.set_default_timeout(30000) # 设置30秒默认超时
         logger.info("Playwright浏览器和新页面已成功启动。")
 
+    @staticmethod
+    async def _route_blocked_resources(route):
+        """拦截配置中指定类型的资源请求，其余请求照常放行。"""
+        if route.request.resource_type in config.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def _launch_browser_with_fallbacks(self, headless: bool, args: list[str]) -> Browser:
         """按配置顺序启动浏览器，默认优先使用系统 Edge，必要时回退到 Playwright Chromium。"""
         channels = self._browser_channel_plan()
@@ -404,6 +417,10 @@ class DriverService:
         except Exception: # 捕获超时等错误
             return None, None
 
+    async def element_exists(self, selector: str) -> bool:
+        """不做任何等待，立即判断页面上是否存在匹配选择器的元素。"""
+        return await self.page.locator(selector).count() > 0
+
     async def get_breadcrumb_parts(self) -> list[str]:
         """从页面提取完整路径信息。"""
         try:
@@ -795,20 +812,26 @@ class DriverService:
         logger.info("正在提取所有题目的正确答案...")
         all_answers = []
         try:
-            # 找到页面上所有包含答案解析的区块
-            analysis_wraps = await self.page.locator(".component-analysis").all()
-            
-            if not analysis_wraps:
+            if await self.page.locator(".component-analysis").count() == 0:
                 logger.info("未找到任何 .component-analysis 区块，跳过答案提取。")
                 return []
 
-            for i, analysis_locator in enumerate(analysis_wraps):
-                # 在每个 .component-analysis 区块内，找到正确答案
-                correct_answer_locator = analysis_locator.locator(".analysis-item:has(.analysis-item-title:has-text('正确答案：')) .component-htmlview")
-                
-                await correct_answer_locator.wait_for(state='visible', timeout=10000)
-                correct_answer_text = (await correct_answer_locator.text_content()).strip()
-                
+            # 在页面内等待每个解析区块的“正确答案”都渲染可见，并一次性取回全部文本
+            answers_handle = await self.page.wait_for_function("""() => {
+                const texts = [];
+                for (const analysis of document.querySelectorAll('.component-analysis')) {
+                    const item = [...analysis.querySelectorAll('.analysis-item')].find(
+                        el => (el.querySelector('.analysis-item-title')?.textContent || '').includes('正确答案：')
+                    );
+                    const view = item?.querySelector('.component-htmlview');
+                    if (!view || view.getClientRects().length === 0) return null;
+                    texts.push(view.textContent.trim());
+                }
+                return texts;
+            }""", timeout=10000)
+            correct_answer_texts = await answers_handle.json_value()
+
+            for correct_answer_text in correct_answer_texts:
                 # 分割字符串（例如 "A B C" -> ['A', 'B', 'C']），并将其展平到最终列表中
                 answers = correct_answer_text.split()
                 if answers:
@@ -5,8 +5,9 @@ from abc import ABC, abstractmethod
 from io import BytesIO
 from typing import List, Dict, Any, Tuple
 
-from playwright.async_api import Locator
+from playwright.async_api import Locator, Error as PlaywrightError
 
+from src import config
 from src.services.ai_service import AIService
 from src.services.cache_service import CacheService
 from src.services.driver_service import DriverService
@@ -14,6 +15,74 @@ from src.strategies.base_strategy import BaseStrategy
 from src.utils import logger
 
 
+# 持久化WebSocket劫持脚本：首次使用时注册为浏览器上下文的初始化脚本，之后每个新文档加载时自动安装；
+# 脚本通过全局变量接收待发送的音频，重复执行时只会刷新音频缓存辅助函数。
+_PERSISTENT_HIJACK_SCRIPT = """
+(() => {
+    // 页面内的音频缓存：每句音频只上传一次，各回合通过 aiActivateAudio(key) 切换待发送的音频
+    window.aiAudioCache = window.aiAudioCache || {};
+    window.aiActivateAudio = (key) => {
+        const payload = window.aiAudioCache[key];
+        if (!payload) return false;
+        window.ai_audio_payload = payload;
+        window.aiAudioSentAt = 0;
+        return true;
+    };
+
+    if (window.isAiWebSocketHijackInstalled) {
+        console.log('[AI-DEBUG] 持久化劫持器已经安装，无需重复操作。');
+        return;
+    }
+    console.log('[AI-DEBUG] 首次安装持久化劫持器...');
+
+    window.originalWebSocket = window.WebSocket;
+
+    window.WebSocket = function(url, protocols) {
+        console.log(`[AI-DEBUG] [持久化] 新的WebSocket连接: ${url}`);
+        const ws = new window.originalWebSocket(url, protocols);
+
+        if (url.includes('speech.unipus.cn')) {
+            console.log('[AI-DEBUG] [持久化] >>> 成功劫持到语音服务器的WebSocket! <<<');
+            const originalSend = ws.send;
+            ws.send = function(data) {
+                const dataType = Object.prototype.toString.call(data);
+                const isBinary = data instanceof Blob || data instanceof ArrayBuffer || ArrayBuffer.isView(data);
+
+                if (window.ai_audio_payload && isBinary) {
+                    console.log(`[AI-DEBUG] [持久化] 检测到二进制数据流 (${dataType})，且AI音频已准备就绪。`);
+                    const payload = window.ai_audio_payload;
+                    delete window.ai_audio_payload; // 确保只使用一次
+
+                    try {
+                        // 载荷在写入时已解码为 ArrayBuffer，这里直接发送；兼容旧的 base64 字符串载荷
+                        const buffer = payload instanceof ArrayBuffer
+                            ? payload
+                            : Uint8Array.from(atob(payload), (c) => c.charCodeAt(0)).buffer;
+                        console.log(`[AI-DEBUG] [持久化] >>> 正在发送AI音频，大小: ${buffer.byteLength}字节。`);
+                        originalSend.call(this, buffer);// TODO: 未来可在此处实现分块发送，模拟真实流式传输行为
+                        window.aiAudioSentAt = performance.now(); // 供Python侧判断音频已送出，提前结束录音
+                        console.log('[AI-DEBUG] [持久化] >>> AI音频发送完毕。');
+                    } catch (e) {
+                        console.error('[AI-DEBUG] [持久化] 音频替换过程中发生错误:', e);
+                    }
+                } else if (isBinary) {
+                    console.log(`[AI-DEBUG] [持久化] 检测到二进制数据流 (${dataType})，但AI音频未准备好。已阻止原始音频发送。`);
+                    // 什么都不做，即阻止原始音频发送
+                } else {
+                    console.log('[AI-DEBUG] [持久化] 检测到非音频数据，直接放行。', data);
+                    originalSend.call(this, data);
+                }
+            };
+        }
+        return ws;
+    };
+
+    window.isAiWebSocketHijackInstalled = true;
+    console.log('[AI-DEBUG] 持久化劫持器已激活。');
+})();
+"""
+
+
 class BaseVoiceStrategy(BaseStrategy, ABC):
     """
     处理所有语音上传类题目的抽象基类。
@@ -25,6 +94,9 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
     def __init__(self, driver_service: DriverService, ai_service: AIService, cache_service: CacheService):
         super().__init__(driver_service, ai_service, cache_service)
         self.strategy_type = "base_voice"  # 子类应覆盖此属性
+        # 按音频缓存键记录的TTS合成任务：预取与正式使用共享同一个任务，避免重复合成
+        self._tts_tasks: Dict[str, asyncio.Task] = {}
+        self._tts_semaphore = asyncio.Semaphore(config.TTS_CONCURRENCY)
 
     @staticmethod
     @abstractmethod
@@ -43,62 +115,82 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
         该脚本会一直存在，通过一个全局变量来接收要发送的音频。
         """
         logger.debug("[AI-DEBUG] 正在安装持久化WebSocket劫持器...")
-        persistent_script = """
-        (() => {
-            if (window.isAiWebSocketHijackInstalled) {
-                console.log('[AI-DEBUG] 持久化劫持器已经安装，无需重复操作。');
-                return;
-            }
-            console.log('[AI-DEBUG] 首次安装持久化劫持器...');
-
-            window.originalWebSocket = window.WebSocket;
-
-            window.WebSocket = function(url, protocols) {
-                console.log(`[AI-DEBUG] [持久化] 新的WebSocket连接: ${url}`);
-                const ws = new window.originalWebSocket(url, protocols);
-
-                if (url.includes('speech.unipus.cn')) {
-                    console.log('[AI-DEBUG] [持久化] >>> 成功劫持到语音服务器的WebSocket! <<<');
-                    const originalSend = ws.send;
-                    ws.send = function(data) {
-                        const dataType = Object.prototype.toString.call(data);
-                        const isBinary = data instanceof Blob || data instanceof ArrayBuffer || ArrayBuffer.isView(data);
-                        
-                        if (window.ai_audio_payload && isBinary) {
-                            console.log(`[AI-DEBUG] [持久化] 检测到二进制数据流 (${dataType})，且AI音频已准备就绪。`);
-                            const payload = window.ai_audio_payload;
-                            delete window.ai_audio_payload; // 确保只使用一次
-
-                            try {
-                                const byteCharacters = atob(payload);
-                                const byteNumbers = new Array(byteCharacters.length);
-                                for (let i = 0; i < byteCharacters.length; i++) {
-                                    byteNumbers[i] = byteCharacters.charCodeAt(i);
-                                }
-                                const byteArray = new Uint8Array(byteNumbers);
-                                console.log(`[AI-DEBUG] [持久化] >>> 正在发送AI音频，大小: ${byteArray.byteLength}字节。`);
-                                originalSend.call(this, byteArray.buffer);// TODO: 未来可在此处实现分块发送，模拟真实流式传输行为
-                                console.log('[AI-DEBUG] [持久化] >>> AI音频发送完毕。');
-                            } catch (e) {
-                                console.error('[AI-DEBUG] [持久化] 音频替换过程中发生错误:', e);
-                            }
-                        } else if (isBinary) {
-                            console.log(`[AI-DEBUG] [持久化] 检测到二进制数据流 (${dataType})，但AI音频未准备好。已阻止原始音频发送。`);
-                            // 什么都不做，即阻止原始音频发送
-                        } else {
-                            console.log('[AI-DEBUG] [持久化] 检测到非音频数据，直接放行。', data);
-                            originalSend.call(this, data);
-                        }
-                    };
-                }
-                return ws;
-            };
+        await self.driver_service.page.evaluate(_PERSISTENT_HIJACK_SCRIPT)
+
+    async def _ensure_persistent_hijack(self):
+        """
+        首次调用时为当前页面安装劫持器，并将同一脚本注册为上下文初始化脚本。
+        之后页面导航产生的新文档会在页面脚本运行前自动安装劫持器，无需每道题、每次尝试再传输并执行整段脚本。
+        """
+        if self.driver_service.persistent_hijack_registered:
+            return
+        await self._install_persistent_hijack()
+        await self.driver_service.context.add_init_script(_PERSISTENT_HIJACK_SCRIPT)
+        self.driver_service.persistent_hijack_registered = True
+        logger.debug("[AI-DEBUG] 持久化劫持器已注册为上下文初始化脚本。")
 
-            window.isAiWebSocketHijackInstalled = true;
-            console.log('[AI-DEBUG] 持久化劫持器已激活。');
-        })();
+    @staticmethod
+    def _tts_params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """从重试参数中取出传给TTS的部分（去掉仅用于日志的 description）。"""
+        return {k: v for k, v in params.items() if k != 'description'}
+
+    def _tts_task(self, text: str, params: Dict[str, Any]) -> asyncio.Task:
+        tts_params = self._tts_params(params)
+        audio_key = self.cache_service.make_audio_key(text, **tts_params)
+        task = self._tts_tasks.get(audio_key)
+        if task is None:
+            task = asyncio.create_task(self._load_tts_audio(audio_key, text, tts_params))
+            self._tts_tasks[audio_key] = task
+        return task
+
+    async def _load_tts_audio(self, audio_key: str, text: str, tts_params: Dict[str, Any]) -> bytes | None:
+        # 磁盘读写放到线程中，避免MB级WAV的文件I/O阻塞事件循环上的其他页面操作
+        audio_bytes = await asyncio.to_thread(self.cache_service.get_audio, audio_key)
+        if audio_bytes:
+            logger.debug(f"命中音频磁盘缓存: {text}")
+            return audio_bytes
+        async with self._tts_semaphore:
+            audio_bytes = await self.ai_service.text_to_wav(text, **tts_params)
+        if audio_bytes:
+            await asyncio.to_thread(self.cache_service.put_audio, audio_key, audio_bytes)
+        return audio_bytes
+
+    def _prefetch_tts_audio(self, texts: List[str], params: Dict[str, Any]):
+        """
+        在后台为各题预先合成音频（并发数受 TTS_CONCURRENCY 限制），不等待结果。
+        逐题录音时通过 _get_tts_audio 取用：已完成则立即返回，未完成则只等待该题。
         """
-        await self.driver_service.page.evaluate(persistent_script)
+        for text in texts:
+            if text:
+                self._tts_task(text, params)
+
+    async def _get_tts_audio(self, text: str, params: Dict[str, Any]) -> bytes | None:
+        task = self._tts_task(text, params)
+        try:
+            audio_bytes = await task
+        except Exception as e:
+            logger.warning(f"TTS合成出错: {e}")
+            audio_bytes = None
+        if not audio_bytes:
+            # 失败的结果不保留，之后仍可重新合成
+            self._tts_tasks = {key: t for key, t in self._tts_tasks.items() if t is not task}
+        return audio_bytes
+
+    def _discard_tts_audio(self, text: str, params_list: List[Dict[str, Any]]):
+        """取消并移除某句在指定参数下尚未完成的合成任务（如推测生成的重试音频已用不上）。"""
+        for params in params_list:
+            audio_key = self.cache_service.make_audio_key(text, **self._tts_params(params))
+            task = self._tts_tasks.get(audio_key)
+            if task is not None and not task.done():
+                task.cancel()
+                del self._tts_tasks[audio_key]
+
+    def _cancel_tts_prefetch(self):
+        """取消尚未完成的预取任务（例如页面中途中止时）。"""
+        for task in self._tts_tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tts_tasks.clear()
 
     async def _execute_single_voice_task(self, container: Locator, ref_text: str, retry_params: List[Dict[str, Any]]) -> Tuple[bool, bool]:
         """
@@ -109,28 +201,36 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
         :param retry_params: 用于重试的TTS参数列表。
         :return: 一个元组 (succeeded, should_abort_page)。
         """
+        try:
+            return await self._run_voice_attempts(container, ref_text, retry_params)
+        finally:
+            # 无论成功还是中止，推测生成但未用上的重试音频都不再需要
+            self._discard_tts_audio(ref_text, retry_params[1:])
+
+    async def _run_voice_attempts(self, container: Locator, ref_text: str, retry_params: List[Dict[str, Any]]) -> Tuple[bool, bool]:
         last_score = 0
-        succeeded = False
 
         for attempt, params in enumerate(retry_params):
             logger.info(f"   --- 第 {attempt + 1}/{len(retry_params)}次尝试 ---")
             try:
                 # 1. 生成音频
-                audio_bytes = await self.ai_service.text_to_wav(ref_text, **{k:v for k,v in params.items() if k != 'description'})
+                audio_bytes = await self._get_tts_audio(ref_text, params)
                 if not audio_bytes:
                     logger.warning("警告：生成TTS音频失败，跳过本次尝试。")
                     continue
 
-                with wave.open(BytesIO(audio_bytes), 'rb') as wf:
-                    frames = wf.getnframes()
-                    rate = wf.getframerate()
-                    duration = frames / float(rate)
+                if attempt == 0:
+                    # 录音、评分期间在后台推测生成其余重试参数的音频，需要重试时可直接取用
+                    for retry_param in retry_params[1:]:
+                        self._tts_task(ref_text, retry_param)
+
+                duration = self._get_wav_duration(audio_bytes)
 
                 # 2. 录音前预检麦克风链路；无实体设备时会触发页面级虚拟流兜底。
                 await self._ensure_microphone_stream_ready()
 
-                # 3. 在每次尝试前，都确保劫持脚本已安装（此操作是幂等的，很安全）
-                await self._install_persistent_hijack()
+                # 3. 在每次尝试前，都确保劫持脚本已安装（同一页面内只会真正注入一次）
+                await self._ensure_persistent_hijack()
 
                 # 4. 设置持久化劫持器要使用的音频载荷
                 await self._set_persistent_audio_payload(audio_bytes)
@@ -142,8 +242,8 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
                 await container.locator(recording_state_selector).wait_for(timeout=5000)
 
                 sleep_duration = min(duration + 0.5, 10) # 限制最长等待时间为10秒
-                logger.debug(f"音频时长 {duration:.2f}s，实际等待 {sleep_duration:.2f}s 模拟录音...")
-                await asyncio.sleep(sleep_duration)
+                logger.debug(f"音频时长 {duration:.2f}s，最多等待 {sleep_duration:.2f}s 模拟录音...")
+                await self._wait_for_audio_sent(sleep_duration)
                 await record_button_locator.click()
 
                 last_score = await self._wait_for_and_get_score(container)
@@ -151,7 +251,6 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
 
                 if last_score >= 85:
                     logger.success("✅ 分数 >= 85，判定为优秀。")
-                    succeeded = True
                     return True, False
                 if last_score < 60:
                     logger.error("❌ 分数 < 60，判定为失败，将中止整个页面。")
@@ -165,13 +264,44 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
                 await asyncio.sleep(1)
             # 注意：持久化模式下，finally块不再需要进行任何清理操作
 
-        if not succeeded and last_score < 80:
+        # 优秀和失败都已在循环内直接返回，走到这里说明所有尝试均未得出明确结论
+        if last_score < 80:
             logger.error(f"❌ 所有尝试结束后，最终分数 ({last_score}) 仍低于80，将中止整个页面。")
             return False, True
         
         logger.success(f"✅ 所有尝试结束后，最终分数 ({last_score}) 在 80-84 之间，判定为可接受。")
         return True, False
 
+    async def _wait_for_audio_sent(self, max_wait: float, idle_ms: int = 200):
+        """
+        等待劫持器把AI音频整段发出、且之后空闲 idle_ms 毫秒，即可结束录音；
+        音频迟迟未发出（如发送丢失）时，最多等待 max_wait 秒，与原先的固定等待一致。
+        """
+        try:
+            await self.driver_service.page.wait_for_function(
+                "(idleMs) => window.aiAudioSentAt > 0 && performance.now() - window.aiAudioSentAt > idleMs",
+                arg=idle_ms,
+                polling=100,
+                timeout=max_wait * 1000
+            )
+        except PlaywrightError:
+            logger.debug(f"   {max_wait:.2f}s 内未确认音频发送完成，按最长等待时间结束录音。")
+
+    @staticmethod
+    def _get_wav_duration(audio_bytes: bytes | None) -> float:
+        if not audio_bytes:
+            return 0.0
+        # Piper 输出的是标准44字节头的PCM WAV，直接读取头部字段即可；其他布局再交给 wave 模块解析
+        if (audio_bytes[0:4] == b'RIFF' and audio_bytes[8:16] == b'WAVEfmt '
+                and audio_bytes[36:40] == b'data'):
+            byte_rate = int.from_bytes(audio_bytes[28:32], 'little')
+            data_size = int.from_bytes(audio_bytes[40:44], 'little')
+            return data_size / byte_rate if byte_rate > 0 else 0.0
+        with wave.open(BytesIO(audio_bytes), 'rb') as wf:
+            frames = wf.getnframes()
+            rate = wf.getframerate()
+            return frames / float(rate) if rate > 0 else 0.0
+
     async def _ensure_microphone_stream_ready(self):
         """
         预先确认页面能创建音频输入流，避免点击录音后才因无麦克风静默失败。
@@ -225,67 +355,56 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
         except Exception as e:
             logger.warning(f"麦克风预检过程异常，仍会继续尝试录音: {e}")
 
+    @staticmethod
+    def _encode_audio_b64(audio_bytes: bytes) -> str:
+        """将音频编码为 base64 文本，用于通过 evaluate 传入页面（调用方在线程中执行，避免阻塞事件循环）。"""
+        return base64.b64encode(audio_bytes).decode('ascii')
+
     # 新增：用于持久化劫持模式下，设置要发送的AI音频载荷
     async def _set_persistent_audio_payload(self, audio_bytes: bytes):
         """
         通过设置一个全局变量来提供预生成的音频数据，供持久化劫持脚本使用。
         """
-        audio_b64 = base64.b64encode(audio_bytes).decode('ascii')
+        audio_b64 = await asyncio.to_thread(self._encode_audio_b64, audio_bytes)
         logger.debug("   ...正在设置AI音频“信使”变量。")
-        await self.driver_service.page.evaluate(f"window.ai_audio_payload = '{audio_b64}';")
-
-    # 新增：用于一次性劫持模式下，生成自包含的劫持脚本
-    def _prepare_one_shot_injection(self, audio_bytes: bytes) -> str:
-        """生成用于注入的、自包含的JavaScript劫持脚本（一次性）。"""
-        audio_b64 = base64.b64encode(audio_bytes).decode('ascii')
-        script_template = """
-        (() => {
-            console.log('[AI-DEBUG] [一次性] 执行一次性劫持脚本...');
-            // 注意：此处不再执行任何清理操作，清理操作完全由 _cleanup_one_shot_injection 负责
-            window.injectedAudioB64OneShot = 'AUDIO_B64_PLACEHOLDER';
-            window.ttsAudioSentOneShot = false;
-            window.originalWebSocketOneShot = window.WebSocket;
-
-            window.WebSocket = function(url, protocols) {
-                console.log(`[AI-DEBUG] [一次性] WebSocket连接: ${url}`);
-                const ws = new window.originalWebSocketOneShot(url, protocols);
-                if (url.includes('speech.unipus.cn')) {
-                    console.log('[AI-DEBUG] [一次性] >>> 劫持到语音WebSocket! <<<');
-                    const originalSend = ws.send;
-                    ws.send = function(data) {
-                        const isBinary = data instanceof Blob || data instanceof ArrayBuffer || ArrayBuffer.isView(data);
-                        if (isBinary) {
-                            if (!window.ttsAudioSentOneShot) {
-                                window.ttsAudioSentOneShot = true;
-                                console.log('[AI-DEBUG] [一次性] 拦截到第一块原始音频数据，准备替换...');
-                                try {
-                                    const byteCharacters = atob(window.injectedAudioB64OneShot);
-                                    const byteNumbers = new Array(byteCharacters.length);
-                                    for (let i = 0; i < byteCharacters.length; i++) {
-                                        byteNumbers[i] = byteCharacters.charCodeAt(i);
-                                    }
-                                    const byteArray = new Uint8Array(byteNumbers);
-                                    console.log(`[AI-DEBUG] [一次性] 发送AI音频，大小: ${byteArray.byteLength}字节。`);
-                                    originalSend.call(this, byteArray.buffer);
-                                    console.log('[AI-DEBUG] [一次性] AI音频发送完毕。');
-                                } catch (e) {
-                                    console.error('[AI-DEBUG] [一次性] 音频替换错误:', e);
-                                }
-                            } else {
-                                console.log('[AI-DEBUG] [一次性] 后续音频块被阻止。');
-                            }
-                        } else {
-                            originalSend.call(this, data);
-                        }
-                    };
-                }
-                return ws;
-            };
-            console.log('[AI-DEBUG] [一次性] 劫持已激活。');
-        })();
+        # 以参数传入而非拼接进脚本源码，并在写入时一次性解码为 ArrayBuffer，发送时无需再解码
+        await self.driver_service.page.evaluate(
+            "(b64) => { window.ai_audio_payload = Uint8Array.from(atob(b64), (c) => c.charCodeAt(0)).buffer; window.aiAudioSentAt = 0; }",
+            audio_b64
+        )
+
+    async def _upload_audio_payloads(self, payloads: Dict[str, bytes]):
+        """
+        将多段音频一次性上传到页面的 window.aiAudioCache 中，已存在的键不会重复上传。
+        之后每回合只需调用 _activate_audio_payload 切换，无需再次传输音频数据。
         """
-        return script_template.replace('AUDIO_B64_PLACEHOLDER', audio_b64)
+        page = self.driver_service.page
+        uploaded_keys = set(await page.evaluate("() => Object.keys(window.aiAudioCache || {})"))
+        pending_payloads = {
+            key: audio_bytes
+            for key, audio_bytes in payloads.items()
+            if audio_bytes and key not in uploaded_keys
+        }
+        if not pending_payloads:
+            return
+        pending = await asyncio.to_thread(
+            lambda: {key: self._encode_audio_b64(audio_bytes) for key, audio_bytes in pending_payloads.items()}
+        )
+        await page.evaluate("""(entries) => {
+            window.aiAudioCache = window.aiAudioCache || {};
+            for (const [key, b64] of Object.entries(entries)) {
+                window.aiAudioCache[key] = Uint8Array.from(atob(b64), (c) => c.charCodeAt(0)).buffer;
+            }
+        }""", pending)
+        logger.debug(f"   ...已向页面上传 {len(pending)} 段音频。")
 
+    async def _activate_audio_payload(self, key: str) -> bool:
+        """
+        将页面缓存中的某段音频设为下一次发送的“信使”音频。缓存中不存在时返回False。
+        """
+        return await self.driver_service.page.evaluate(
+            "(key) => typeof window.aiActivateAudio === 'function' && window.aiActivateAudio(key)", key
+        )
 
     async def _wait_for_and_get_score(self, container: Locator, timeout: int = 20000) -> int:
         """
@@ -293,40 +412,42 @@ class BaseVoiceStrategy(BaseStrategy, ABC):
         """
         score_element = container.locator("span.score_layout, .score")
         try:
-            await self.driver_service.page.wait_for_function(
-                r"""(el) => {
-                    if (!el || !el.textContent) return false;
-                    const isVisible = el.offsetParent !== null;
-                    const hasNumber = /^\d+$/.test(el.textContent.trim());
-                    return isVisible && hasNumber;
-                }""",
-                arg=await score_element.element_handle(),
+            # 由 MutationObserver 在DOM变化时检查分数，而不是按帧轮询；分数出现后直接返回文本，省去再次读取
+            score_str = await score_element.evaluate(
+                r"""(el, timeout) => new Promise((resolve, reject) => {
+                    const readScore = () => {
+                        const text = (el.textContent || '').trim();
+                        return el.offsetParent !== null && /^\d+$/.test(text) ? text : null;
+                    };
+                    const initial = readScore();
+                    if (initial !== null) return resolve(initial);
+
+                    const observer = new MutationObserver(() => {
+                        const score = readScore();
+                        if (score !== null) {
+                            observer.disconnect();
+                            clearTimeout(timer);
+                            resolve(score);
+                        }
+                    });
+                    const timer = setTimeout(() => {
+                        observer.disconnect();
+                        reject(new Error(`等待分数超时 (${timeout}ms)`));
+                    }, timeout);
+                    // 分数可能由祖先元素的 class/style 变化而变为可见，因此观察整个文档
+                    observer.observe(document.body, {
+                        subtree: true, childList: true, characterData: true,
+                        attributes: true, attributeFilter: ['class', 'style', 'hidden'],
+                    });
+                })""",
+                timeout,
                 timeout=timeout
             )
-            score_str = await score_element.text_content()
             return int(score_str)
         except Exception as e:
             logger.error(f"   等待或解析分数时出错: {e}")
             return 0
 
-    # 用于清理一次性劫持的旧方法
-    async def _cleanup_one_shot_injection(self):
-        """
-        清理一次性注入的脚本和全局变量，恢复原始WebSocket。
-        """
-        try:
-            await self.driver_service.page.evaluate("""
-                if (window.originalWebSocketOneShot) {
-                    window.WebSocket = window.originalWebSocketOneShot;
-                    delete window.originalWebSocketOneShot;
-                    delete window.injectedAudioB64OneShot;
-                    delete window.ttsAudioSentOneShot;
-                    console.log('[AI-DEBUG] [一次性] 劫持脚本已清理。');
-                }
-            """)
-        except Exception as e:
-            logger.error(f"清理一次性劫持脚本时发生错误: {e}")
-
     # 用于清理持久化劫持的“信使”变量
     async def _clear_persistent_audio_payload(self):
         """
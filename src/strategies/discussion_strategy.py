@@ -41,7 +41,7 @@ class DiscussionStrategy(BaseStrategy):
             sub_questions_selector = ".question-common-abs-material .component-htmlview p"
             sub_question_locators = await self.driver_service.page.locator(sub_questions_selector).all()
             sub_questions = [await loc.text_content() for loc in sub_question_locators if (await loc.text_content()).strip()]
-            sub_questions_text = "\n".join([f"- {q.strip()}" for i, q in enumerate(sub_questions)])
+            sub_questions_text = "\n".join(f"- {q.strip()}" for q in sub_questions)
             
             logger.info(f"提取到主标题: {main_title}")
             logger.info(f"提取到 {len(sub_questions)} 个子问题:\n{sub_questions_text}")
@@ -24,10 +24,15 @@ class MultipleChoiceStrategy(BaseStrategy):
     async def check(driver_service: DriverService) -> bool:
        """检查当前页面是否为多选题。"""
        try:
-           is_question_wrap_visible = await driver_service.page.locator("div.question-common-abs-choice.multipleChoice").first.is_visible(timeout=2000)
-           is_option_wrap_visible = await driver_service.page.locator(".option-wrap").first.is_visible(timeout=2000)
+           # 一次往返同时检查题目容器与选项容器是否可见
+           is_multiple_choice = await driver_service.page.evaluate("""() => {
+               const isVisible = (el) => !!el && el.getClientRects().length > 0
+                   && getComputedStyle(el).visibility !== 'hidden';
+               return isVisible(document.querySelector('div.question-common-abs-choice.multipleChoice'))
+                   && isVisible(document.querySelector('.option-wrap'));
+           }""")
            
-           if is_question_wrap_visible and is_option_wrap_visible:
+           if is_multiple_choice:
                logger.info("页面初步符合[多选题]特征，应用多选题策略。")
                return True
            return False
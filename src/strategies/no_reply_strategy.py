@@ -25,31 +25,28 @@ class NoReplyStrategy(BaseStrategy):
         同时页面上存在可播放的媒体文件。
         """
         try:
-            # 1. 检查页面是否无作答区域
-            container = driver_service.page.locator(".layoutBody-container")
-            if await container.count() > 0:
-                class_attr = await container.first.get_attribute("class")
-                # 必须没有作答区域
-                if class_attr and "has-reply" not in class_attr:
-                    # 辅助判断：确保页面不是空的或错误的，且必须有 material
-                    if await driver_service.page.locator(".question-common-abs-material").count() > 0:
-                        # 2. 检查是否存在媒体文件
-                        media_url, _ = await driver_service.get_media_source_and_type()
-                        if media_url:
-                            logger.info("检测到页面无作答区域，且包含媒体文件，应用“无作答页面策略”。")
-                            return True
-                        else:
-                            logger.info("检测到页面无作答区域，但未发现媒体文件，不应用“无作答页面策略”。")
-                            return False
-                    else:
-                        logger.info("检测到页面无作答区域，但无 .question-common-abs-material，不应用“无作答页面策略”。")
-                        return False
-                else:
-                    logger.info("检测到页面有作答区域 (含has-reply class)，不应用“无作答页面策略”。")
-                    return False
-            else:
+            # 按开销从低到高依次判断，任一条件不满足即立即返回。
+            # 1. 无等待的存在性探测：主容器与材料区
+            if not await driver_service.element_exists(".layoutBody-container"):
                 logger.info("未找到 .layoutBody-container，不应用“无作答页面策略”。")
                 return False
+            if not await driver_service.element_exists(".question-common-abs-material"):
+                logger.info("未找到 .question-common-abs-material，不应用“无作答页面策略”。")
+                return False
+
+            # 2. 页面必须没有作答区域
+            class_attr = await driver_service.page.locator(".layoutBody-container").first.get_attribute("class")
+            if not class_attr or "has-reply" in class_attr:
+                logger.info("检测到页面有作答区域 (含has-reply class)，不应用“无作答页面策略”。")
+                return False
+
+            # 3. 最后才做开销最大的媒体文件探测
+            media_url, _ = await driver_service.get_media_source_and_type()
+            if media_url:
+                logger.info("检测到页面无作答区域，且包含媒体文件，应用“无作答页面策略”。")
+                return True
+            logger.info("检测到页面无作答区域，但未发现媒体文件，不应用“无作答页面策略”。")
+            return False
         except PlaywrightError as e:
             logger.error(f"检查 NoReplyStrategy 时出错: {e}")
             return False
@@ -1,4 +1,5 @@
 import asyncio
+import re
 
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Locator
@@ -10,6 +11,20 @@ from src.services.driver_service import DriverService
 from src.strategies.base_voice_strategy import BaseVoiceStrategy
 from src.utils import logger
 
+# 说明文字中出现该短语时，需要先回到前文任务页获取文章
+_NEEDS_REMOTE_ARTICLE = re.compile(r"about the passage you have just read", re.IGNORECASE)
+
+# 页面选择器
+_RECORD_BUTTON_SEL = ".button-record"
+_OLD_CONTAINER_SEL = ".oral-personal-state-wrapper"  # 旧版语音题容器
+_NEW_CONTAINER_SEL = ".oral-state-record-wrapper"  # 新版（口语陈述）语音题容器
+_QA_CONTAINERS_SEL = ".p-oral-personal-state .oral-personal-state-wrapper"
+_ORAL_CONTAINERS_SEL = ".oral-container.oral-state-record-margin"
+_QA_QUESTION_SEL = ".oral-personal-state-oral-container .oral-personal-state-sentence-container .component-htmlview"
+_ORAL_MAIN_QUESTION_SEL = ".score-sentence-container .component-htmlview"
+_ORAL_KEYWORDS_SEL = ".sentence-container .media-sentenceContainer"
+_ARTICLE_CONTENT_SEL = ".comp-common-article-content"
+
 
 class QAVoiceStrategy(BaseVoiceStrategy):
     """
@@ -30,16 +45,12 @@ class QAVoiceStrategy(BaseVoiceStrategy):
     async def check(driver_service: DriverService) -> bool:
         try:
             # 检查是否有录音按钮，这是所有语音题的共同点
-            record_button_selector = ".button-record"
-            if not await driver_service.page.locator(record_button_selector).first.is_visible(timeout=1000):
+            if not await driver_service.page.locator(_RECORD_BUTTON_SEL).first.is_visible(timeout=1000):
                 return False
 
             # 检查旧版或新版语音题的容器
-            old_container = ".oral-personal-state-wrapper"
-            new_container = ".oral-state-record-wrapper"
-            
             # 使用 locator.or_() 来同时检查两种容器
-            combined_locator = driver_service.page.locator(old_container).or_(driver_service.page.locator(new_container))
+            combined_locator = driver_service.page.locator(_OLD_CONTAINER_SEL).or_(driver_service.page.locator(_NEW_CONTAINER_SEL))
             
             if await combined_locator.first.is_visible(timeout=1000):
                 logger.info("检测到语音简答题结构，应用QAVoiceStrategy。")
@@ -53,7 +64,7 @@ class QAVoiceStrategy(BaseVoiceStrategy):
         logger.info("=" * 20)
         logger.info("开始执行语音问答策略 (QAVoiceStrategy)...")
 
-        is_oral_recitation_type = await self.driver_service.page.locator(".oral-state-record-wrapper").first.is_visible(timeout=500)
+        is_oral_recitation_type = await self.driver_service.page.locator(_NEW_CONTAINER_SEL).first.is_visible(timeout=500)
         should_abort_page = False
 
         direction_text, additional_material, page_level_article_text = "", "", ""
@@ -65,7 +76,7 @@ class QAVoiceStrategy(BaseVoiceStrategy):
             direction_text, additional_material = results
             logger.info("页面级信息提取完毕。")
 
-            if "about the passage you have just read" in direction_text and not config.HAS_FETCHED_REMOTE_ARTICLE:
+            if not config.HAS_FETCHED_REMOTE_ARTICLE and _NEEDS_REMOTE_ARTICLE.search(direction_text):
                 logger.info("检测到需要返回前文获取文章的特殊语音题型。")
                 try:
                     header_tasks_container = self.driver_service.page.locator(".pc-header-tasks-container")
@@ -85,7 +96,7 @@ class QAVoiceStrategy(BaseVoiceStrategy):
                     logger.debug(f"文章提取完毕，正在返回 '{original_tab_title}'...")
                     original_tab_locator = header_tasks_container.locator(f'[title="{original_tab_title}"]')
                     await original_tab_locator.click()
-                    await self.driver_service.page.locator(".p-oral-personal-state .oral-personal-state-wrapper").wait_for(timeout=15000)
+                    await self.driver_service.page.locator(_QA_CONTAINERS_SEL).wait_for(timeout=15000)
                     logger.success("已成功返回问题页面。")
                     config.HAS_FETCHED_REMOTE_ARTICLE = True
                     logger.info("远程文章获取状态锁已激活，本次“题中题”不再重复跳转。")
@@ -95,74 +106,52 @@ class QAVoiceStrategy(BaseVoiceStrategy):
         else:
             logger.info("检测到『口语陈述题』，将根据主问题和笔记扩展成句子。")
 
-        all_question_containers = []
-        if is_oral_recitation_type:
-            all_question_containers = await self.driver_service.page.locator(".oral-container.oral-state-record-margin").all()
-        else:
-            all_question_containers = await self.driver_service.page.locator(".p-oral-personal-state .oral-personal-state-wrapper").all()
-
+        containers_locator = self.driver_service.page.locator(_ORAL_CONTAINERS_SEL if is_oral_recitation_type else _QA_CONTAINERS_SEL)
+        all_question_containers = await containers_locator.all()
         logger.info(f"发现 {len(all_question_containers)} 个语音题容器。")
 
-        for i, container in enumerate(all_question_containers):
-            logger.info(f"--- 开始处理第 {i + 1} 个语音题 ---")
+        # 读写分离：先一次性读取所有容器的题目文本，再逐题执行录音等写操作，避免读写交错。
+        container_texts = await self._extract_container_texts(containers_locator)
+
+        # 阶段一：按并发上限提取题目并生成答案。需要人工确认时退化为串行，避免多个 input() 交错。
+        # 运行模式在执行期间不会改变，这里取一次快照，后续各处确认逻辑共用
+        needs_confirm = not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM)
+        semaphore = asyncio.Semaphore(1 if needs_confirm else config.QA_VOICE_CONCURRENCY)
+        abort_event = asyncio.Event()
+
+        async def prepare(index: int, container: Locator) -> str | None:
+            async with semaphore:
+                if abort_event.is_set():
+                    return None
+                answer = await self._prepare_answer_text(
+                    index, container, container_texts[index], is_oral_recitation_type,
+                    direction_text, additional_material, page_level_article_text, shared_context,
+                    needs_confirm
+                )
+                if not answer:
+                    abort_event.set()
+                return answer
+
+        answer_texts = await asyncio.gather(
+            *(prepare(i, container) for i, container in enumerate(all_question_containers)),
+            return_exceptions=True
+        )
+
+        # 答案确定后立即在后台预合成各题音频，与逐题录音重叠进行
+        self._prefetch_tts_audio([text for text in answer_texts if isinstance(text, str)], self.RETRY_PARAMS[0])
+
+        # 阶段二：录音依赖同一个持久化劫持器和麦克风链路，必须逐题串行执行。
+        for i, (container, answer_text) in enumerate(zip(all_question_containers, answer_texts)):
+            if isinstance(answer_text, Exception):
+                logger.error(f"处理第 {i + 1} 个语音题时发生严重错误: {answer_text}")
+                should_abort_page = True
+                break
+            if not answer_text:
+                should_abort_page = True
+                break
+
+            logger.info(f"--- 开始录制第 {i + 1} 个语音题 ---")
             try:
-                prompt = ""
-                if is_oral_recitation_type:
-                    main_question_locator = container.locator(".score-sentence-container .component-htmlview")
-                    main_question = (await main_question_locator.text_content() or "").strip()
-
-                    content_elements = await container.locator(".sentence-container .media-sentenceContainer").all()
-                    all_content_texts = []
-                    for elem in content_elements:
-                        text = (await elem.text_content() or "").strip()
-                        if text:
-                            all_content_texts.append(text)
-                    keywords_text = "\n".join(all_content_texts)
-
-                    if not keywords_text:
-                        logger.error("在当前容器中找不到关键词笔记，中止。")
-                        should_abort_page = True
-                        break
-                    
-                    logger.info(f"提取到主问题: '{main_question}'")
-                    logger.info(f"提取到关键词: '{keywords_text}'")
-                    prompt = prompts.ORAL_RECITATION_PROMPT.format(main_question=main_question, keywords=keywords_text)
-                else:
-                    question_locator = container.locator(".oral-personal-state-oral-container .oral-personal-state-sentence-container .component-htmlview")
-                    logger.info("正在并发提取当前题目信息...")
-                    sub_question_tasks = [self._get_article_text(container=container), question_locator.text_content(timeout=5000)]
-                    results = await asyncio.gather(*sub_question_tasks)
-                    current_question_media_text, question_text_raw = results[0], (results[1] or "")
-                    logger.info("当前题目信息提取完毕。")
-
-                    if not question_text_raw.strip():
-                        logger.error("在当前容器中找不到问题文本，中止。")
-                        should_abort_page = True
-                        break
-                    
-                    question_text = question_text_raw.strip()
-                    logger.info(f"提取到问题文本: '{question_text}'")
-                    combined_article_text = f"{page_level_article_text}\n{current_question_media_text}\n{shared_context}".strip()
-                    prompt = prompts.QAVOICE_PROMPT.format(direction_text=direction_text, article_text=combined_article_text, additional_material=additional_material, question_text=question_text)
-                
-                if not config.IS_AUTO_MODE:
-                    logger.info("=" * 50)
-                    logger.info("即将发送给 AI 的完整 Prompt 如下：")
-                    logger.info(prompt)
-                    logger.info("=" * 50)
-                if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
-                    confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
-                    if confirm.strip().upper() not in ["Y", ""]:
-                        logger.warning("用户取消了 AI 调用，终止当前任务。")
-                        should_abort_page = True
-                        break
-                json_data = self.ai_service.get_chat_completion(prompt)
-                if not json_data or "answer" not in json_data:
-                    logger.error("AI未能生成有效答案或返回格式不正确，中止当前页面。")
-                    should_abort_page = True
-                    break
-                answer_text = json_data.get("answer")
-                logger.info(f"AI生成的答案: '{answer_text}'")
                 succeeded, should_abort_from_task = await self._execute_single_voice_task(container=container, ref_text=answer_text, retry_params=self.RETRY_PARAMS)
                 if should_abort_from_task:
                     should_abort_page = True
@@ -172,16 +161,15 @@ class QAVoiceStrategy(BaseVoiceStrategy):
                 logger.error(f"处理第 {i + 1} 个语音题时发生严重错误: {e}")
                 should_abort_page = True
                 break
-            finally:
-                await self._cleanup_one_shot_injection()
         
+        self._cancel_tts_prefetch()
         logger.info("所有语音简答题处理完毕。")
         if should_abort_page:
             logger.warning("由于发生错误或分数不达标，已中止最终提交。")
             return False, False
         if not is_chained_task:
             should_submit = True
-            if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
+            if needs_confirm:
                 confirm = await asyncio.to_thread(input, "所有语音简答题均已完成且分数达标。是否确认提交？[Y/n]: ")
                 if confirm.strip().upper() not in ["Y", ""]:
                     should_submit = False
@@ -197,22 +185,112 @@ class QAVoiceStrategy(BaseVoiceStrategy):
         
         return True, False
 
+    async def _prepare_answer_text(
+        self,
+        index: int,
+        container: Locator,
+        texts: dict,
+        is_oral_recitation_type: bool,
+        direction_text: str,
+        additional_material: str,
+        page_level_article_text: str,
+        shared_context: str,
+        needs_confirm: bool,
+    ) -> str | None:
+        """提取单个语音题的题目信息并请求AI生成答案；返回 None 表示应中止整个页面。"""
+        logger.info(f"--- 开始处理第 {index + 1} 个语音题 ---")
+        if is_oral_recitation_type:
+            main_question = texts["main_question"]
+            keywords_text = "\n".join(texts["keywords"])
+
+            if not keywords_text:
+                logger.error("在当前容器中找不到关键词笔记，中止。")
+                return None
+            
+            logger.info(f"提取到主问题: '{main_question}'")
+            logger.info(f"提取到关键词: '{keywords_text}'")
+            prompt = prompts.ORAL_RECITATION_PROMPT.format(main_question=main_question, keywords=keywords_text)
+        else:
+            question_text_raw = texts["question"]
+            logger.info("正在提取当前题目的媒体材料...")
+            if question_text_raw:
+                current_question_media_text = await self._get_article_text(container=container)
+            else:
+                # 批量读取时题干尚未渲染，回退为带等待的单独读取
+                sub_question_tasks = [self._get_article_text(container=container), container.locator(_QA_QUESTION_SEL).text_content(timeout=5000)]
+                current_question_media_text, question_text_raw = await asyncio.gather(*sub_question_tasks)
+                question_text_raw = question_text_raw or ""
+            logger.info("当前题目信息提取完毕。")
+
+            if not question_text_raw.strip():
+                logger.error("在当前容器中找不到问题文本，中止。")
+                return None
+            
+            question_text = question_text_raw.strip()
+            logger.info(f"提取到问题文本: '{question_text}'")
+            combined_article_text = f"{page_level_article_text}\n{current_question_media_text}\n{shared_context}".strip()
+            prompt = prompts.QAVOICE_PROMPT.format(direction_text=direction_text, article_text=combined_article_text, additional_material=additional_material, question_text=question_text)
+        
+        if not config.IS_AUTO_MODE:
+            logger.info("=" * 50)
+            logger.info("即将发送给 AI 的完整 Prompt 如下：")
+            logger.info(prompt)
+            logger.info("=" * 50)
+        if needs_confirm:
+            confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
+            if confirm.strip().upper() not in ["Y", ""]:
+                logger.warning("用户取消了 AI 调用，终止当前任务。")
+                return None
+        # 放到线程中执行，使并发的多道题可以同时等待AI响应
+        json_data = await asyncio.to_thread(self.ai_service.get_chat_completion, prompt)
+        if not json_data or "answer" not in json_data:
+            logger.error("AI未能生成有效答案或返回格式不正确，中止当前页面。")
+            return None
+        answer_text = json_data.get("answer")
+        logger.info(f"AI生成的答案: '{answer_text}'")
+        return answer_text
+
+    async def _extract_container_texts(self, containers_locator: Locator) -> list[dict]:
+        """通过一次 evaluate_all 读取所有语音题容器内的主问题、关键词笔记和问题文本。"""
+        return await containers_locator.evaluate_all(
+            """(elements, selectors) => elements.map((el) => {
+                const textOf = (node) => ((node && node.textContent) || '').trim();
+                return {
+                    main_question: textOf(el.querySelector(selectors.mainQuestion)),
+                    keywords: Array.from(el.querySelectorAll(selectors.keywords)).map(textOf).filter(Boolean),
+                    question: textOf(el.querySelector(selectors.question)),
+                };
+            })""",
+            {
+                "mainQuestion": _ORAL_MAIN_QUESTION_SEL,
+                "keywords": _ORAL_KEYWORDS_SEL,
+                "question": _QA_QUESTION_SEL,
+            },
+        )
+
     async def _get_article_text(self, container: Locator | None = None) -> str:
         search_scope = container if container else self.driver_service.page
         media_url, media_type = await self.driver_service.get_media_source_and_type(search_scope=search_scope)
         if media_url:
+            article_text = self.cache_service.get_transcript(media_url)
+            if article_text:
+                logger.info(f"复用已缓存的 {media_type} 转写结果。")
+                return article_text
             logger.info(f"发现 {media_type} 文件，准备转写: {media_url}")
             try:
-                article_text = self.ai_service.transcribe_media_from_url(media_url)
+                # 下载与转写都是阻塞操作，放到线程中执行，避免卡住并发准备的其他题目和页面操作
+                article_text = await asyncio.to_thread(self.ai_service.transcribe_media_from_url, media_url)
                 if not article_text:
                     logger.warning("媒体文件转写失败。")
+                else:
+                    self.cache_service.save_transcript(media_url, article_text)
                 return article_text
             except Exception as e:
                 logger.error(f"媒体文件转写时发生错误: {e}")
                 return ""
         
         try:
-            article_locator = search_scope.locator(".comp-common-article-content").first
+            article_locator = search_scope.locator(_ARTICLE_CONTENT_SEL).first
             if await article_locator.is_visible(timeout=500):
                 logger.debug("发现文章容器，正在提取文本...")
                 return await article_locator.text_content()
@@ -28,13 +28,16 @@ class ReadAloudStrategy(BaseVoiceStrategy):
     async def check(driver_service: DriverService) -> bool:
         """检查当前页面是否为文字朗读题目。"""
         try:
-            record_button_selector = ".button-record"
-            is_visible = await driver_service.page.locator(record_button_selector).first.is_visible(timeout=2000)
-            if is_visible:
-                sentence_container_selector = ".oral-study-sentence"
-                if await driver_service.page.locator(sentence_container_selector).count() > 0:
-                    logger.info("检测到录音按钮和朗读句子容器，应用文字朗读策略。")
-                    return True
+            # 一次往返同时检查录音按钮是否可见、朗读句子容器是否存在
+            is_read_aloud = await driver_service.page.evaluate("""() => {
+                const button = document.querySelector('.button-record');
+                const buttonVisible = !!button && button.getClientRects().length > 0
+                    && getComputedStyle(button).visibility !== 'hidden';
+                return buttonVisible && document.querySelector('.oral-study-sentence') !== null;
+            }""")
+            if is_read_aloud:
+                logger.info("检测到录音按钮和朗读句子容器，应用文字朗读策略。")
+                return True
         except Exception:
             return False
         return False
@@ -43,26 +46,34 @@ class ReadAloudStrategy(BaseVoiceStrategy):
         logger.info("=" * 20)
         logger.info("开始执行文字朗读策略...")
 
+        page = self.driver_service.page
+        # 运行模式由主流程在运行时切换，不能做成模块级常量；每次执行开始时取一次快照
+        needs_confirm = not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM)
         question_containers_selector = ".oral-study-sentence"
-        question_containers = await self.driver_service.page.locator(question_containers_selector).all()
+        containers_locator = page.locator(question_containers_selector)
+        question_containers = await containers_locator.all()
         logger.info(f"发现 {len(question_containers)} 个朗读题容器。")
 
+        # 一次取回全部题目的朗读文本（文本元素不可见时为 null）。
+        # 此处的文本将直接传递给AI服务，由其内部的净化函数统一处理
+        ref_texts = await containers_locator.evaluate_all("""els => els.map(el => {
+            const textEl = el.querySelector('.sentence-html-container');
+            return textEl && textEl.getClientRects().length > 0 ? textEl.textContent.trim() : null;
+        })""")
+        # 后台为所有题目预合成第一组参数的音频，录制第一题时其余题目的音频同时在合成
+        self._prefetch_tts_audio(ref_texts, self.RETRY_PARAMS[0])
+
         should_abort_page = False
 
-        for i, container in enumerate(question_containers):
+        for i, (container, ref_text) in enumerate(zip(question_containers, ref_texts)):
             logger.info(f"--- 开始处理第 {i + 1} 个朗读题 ---")
 
             try:
-                ref_text_locator = container.locator(".sentence-html-container")
-                if not await ref_text_locator.is_visible(timeout=5000):
+                if ref_text is None:
                     logger.error("错误：在当前容器中找不到朗读文本元素，中止本页面所有语音题。")
                     should_abort_page = True
                     break
                 
-                # 1. 提取原始文本
-                # 此处的文本将直接传递给AI服务，由其内部的净化函数统一处理
-                ref_text = (await ref_text_locator.text_content()).strip()
-                
                 logger.info(f"提取待朗读文本: '{ref_text}'")
 
                 succeeded, should_abort_from_task = await self._execute_single_voice_task(
@@ -80,6 +91,7 @@ class ReadAloudStrategy(BaseVoiceStrategy):
                 should_abort_page = True
                 break
 
+        self._cancel_tts_prefetch()
         logger.info("所有语音题处理完毕。")
 
         if should_abort_page:
@@ -88,13 +100,13 @@ class ReadAloudStrategy(BaseVoiceStrategy):
 
         if not is_chained_task:
             should_submit = True
-            if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
+            if needs_confirm:
                 confirm = await asyncio.to_thread(input, "所有语音题均已完成且分数达标。是否确认提交？[Y/n]: ")
                 if confirm.strip().upper() not in ["Y", ""]:
                     should_submit = False
 
             if should_submit:
-                await self.driver_service.page.click(".btn")
+                await page.click(".btn")
                 await self.driver_service.handle_rate_limit_modal()
                 logger.info("答案已提交。正在处理最终确认弹窗...")
                 await self.driver_service.handle_submission_confirmation()
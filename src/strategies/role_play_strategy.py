@@ -1,6 +1,7 @@
-import wave
-from io import BytesIO
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Tuple
+
+from playwright.async_api import Locator
 
 from src.services.ai_service import AIService
 from src.services.cache_service import CacheService
@@ -8,12 +9,26 @@ from src.services.driver_service import DriverService
 from src.strategies.base_voice_strategy import BaseVoiceStrategy
 from src.utils import logger
 
+# 页面选择器
+_ROLE_PLAY_SEL = ".question-role-play"
+_ROLE_SEL = ".role-list .role"
+_LIST_BOX_SEL = ".role-play-quiz .list-box"
+_LIST_ITEM_SEL = ".list-item-review"
+_ACTIVE_TURN_SEL = ".list-item-review.active"
+_PAUSE_ICON_SEL = "svg.pause-circle-player path[d^='M464.54']"  # 回合开始后出现的暂停图标
+_ACTIVE_PAUSE_BUTTON_SEL = "svg.pause-circle-player.active"
+_RECORD_SEAT_SEL = ".record-seat"  # 总的“开始”按钮
+_SUBMIT_SEL = ".btn:has-text('提交'), .btn:has-text('提 交')"
+_FINAL_BUTTON_SEL = f"{_SUBMIT_SEL}, .btn:has-text('下一题')"
 
 class RolePlayStrategy(BaseVoiceStrategy):
     def __init__(self, driver_service: DriverService, ai_service: AIService, cache_service: CacheService):
         super().__init__(driver_service, ai_service, cache_service)
         self.my_turns: List[Dict[str, Any]] = []
-        self.audio_cache: Dict[str, bytes] = {}
+        self.audio_cache: Dict[str, Tuple[bytes | None, float]] = {}  # 文本 -> (音频字节, 音频时长秒数)
+        # 提交/开始按钮的定位器在 execute 开始时构建一次，重试轮次间复用
+        self.submit_button_locator: Locator | None = None
+        self.record_seat_locator: Locator | None = None
 
     @staticmethod
     async def check(driver_service: DriverService) -> bool:
@@ -21,7 +36,7 @@ class RolePlayStrategy(BaseVoiceStrategy):
         检查当前页面是否为 Role-Play 题型。
         """
         try:
-            await driver_service.page.locator(".question-role-play").wait_for(timeout=3000)
+            await driver_service.page.locator(_ROLE_PLAY_SEL).wait_for(timeout=3000)
             logger.info("检测到 Role-Play 题型。")
             return True
         except Exception:
@@ -30,14 +45,22 @@ class RolePlayStrategy(BaseVoiceStrategy):
     async def execute(self, shared_context: str = "", is_chained_task: bool = False, sub_task_index: int = -1) -> tuple[bool, bool]:
         logger.info("开始执行 Role-Play 策略...")
         await self._ensure_microphone_stream_ready()
-        await self._install_persistent_hijack()
+        await self._ensure_persistent_hijack()
 
+        page = self.driver_service.page
+        self.submit_button_locator = page.locator(_SUBMIT_SEL).first
+        self.record_seat_locator = page.locator(_RECORD_SEAT_SEL)
         max_retries = 2
         score_threshold = 85.0
         current_retry = 0
 
         while current_retry <= max_retries:
-            await self._prepare_turns()
+            # 每轮（含重试）都重新选择角色；列表未变化时只跳过回合识别与音频准备
+            await self._select_first_role()
+            if current_retry == 0 or await self._turn_list_changed():
+                await self._prepare_turns()
+            else:
+                logger.info("对话列表结构未变化，复用上一轮识别的回合与音频。")
 
             if not self.my_turns:
                 logger.error("未能识别出任何需要朗读的句子。")
@@ -48,8 +71,7 @@ class RolePlayStrategy(BaseVoiceStrategy):
             if average_score >= score_threshold:
                 logger.success(f"平均分 {average_score:.2f} 达到阈值 {score_threshold}，任务成功。")
                 if not is_chained_task:
-                    submit_button_locator = self.driver_service.page.locator(".btn:has-text('提交'), .btn:has-text('提 交')").first
-                    await submit_button_locator.click()
+                    await self.submit_button_locator.click()
                     await self.driver_service.handle_rate_limit_modal()
                     logger.info("已点击提交按钮。")
                     await self.driver_service.handle_submission_confirmation()
@@ -58,7 +80,7 @@ class RolePlayStrategy(BaseVoiceStrategy):
                 current_retry += 1
                 if current_retry <= max_retries:
                     logger.info(f"平均分 {average_score:.2f} 未达到阈值。准备进行第 {current_retry} 次重试...")
-                    await self.driver_service.page.locator(".record-seat").click()
+                    await self.record_seat_locator.click()
                     logger.info("已点击“开始”按钮以重试。")
                 else:
                     logger.error("已达到最大重试次数，任务失败。")
@@ -73,96 +95,145 @@ class RolePlayStrategy(BaseVoiceStrategy):
                     return False, False
         return False, False
 
+    async def _select_first_role(self):
+        await self.driver_service.page.locator(_ROLE_SEL).first.click()
+        logger.debug("已选择第一个角色。")
+
     async def _prepare_turns(self):
         logger.info("进入准备阶段...")
-        await self.driver_service.page.locator(".role-list .role").first.click()
-        logger.debug("已选择第一个角色。")
+        page = self.driver_service.page
 
-        list_box = self.driver_service.page.locator(".role-play-quiz .list-box")
+        list_box = page.locator(_LIST_BOX_SEL)
         await list_box.wait_for(timeout=5000)
         logger.debug("对话列表已加载。")
 
         self.my_turns = []
-        all_items = await list_box.locator(".list-item-review").all()
-        logger.info(f"发现 {len(all_items)} 个对话项，开始筛选我方回合...")
-
-        for item in all_items:
-            score_div = item.locator(".score")
-            is_hidden = await score_div.evaluate("el => el.classList.contains('hide')")
-            
-            if not is_hidden:
-                text_locator = item.locator(".component-htmlview p")
-                try:
-                    text = await text_locator.text_content(timeout=1000)
-                    if text:
-                        self.my_turns.append({"text": text.strip(), "locator": item})
-                        logger.debug(f"找到我方回合: {text.strip()}")
-                except Exception:
-                    continue
-        
+        items_locator = list_box.locator(_LIST_ITEM_SEL)
+        # 一次性读取所有对话项的分数区隐藏状态和句子文本，避免逐项往返浏览器
+        item_states = await items_locator.evaluate_all("""
+            els => els.map(el => {
+                const score = el.querySelector('.score');
+                const textEl = el.querySelector('.component-htmlview p');
+                return {
+                    hidden: score ? score.classList.contains('hide') : true,
+                    text: textEl ? textEl.textContent.trim() : '',
+                };
+            })
+        """)
+        logger.info(f"发现 {len(item_states)} 个对话项，开始筛选我方回合...")
+
+        for index, state in enumerate(item_states):
+            if not state["hidden"] and state["text"]:
+                self.my_turns.append({"text": state["text"], "locator": items_locator.nth(index)})
+                logger.debug(f"找到我方回合: {state['text']}")
+
+        # 监听对话列表的增删：重试时若列表未被重建，则无需重新准备回合
+        await list_box.evaluate("""el => {
+            el.__aiTurnsDirty = false;
+            if (!el.__aiTurnsObserver) {
+                el.__aiTurnsObserver = new MutationObserver(() => { el.__aiTurnsDirty = true; });
+                el.__aiTurnsObserver.observe(el, { childList: true });
+            }
+        }""")
+
         logger.info(f"共找到 {len(self.my_turns)} 个我方回合。")
 
-        self.audio_cache = {}
+        # self.audio_cache 作为内存热缓存在重试间保留；未命中时再查磁盘缓存，最后才调用TTS
         logger.info("开始预生成音频...")
-        for turn in self.my_turns:
-            text = turn["text"]
-            if text not in self.audio_cache:
-                audio_bytes = await self.ai_service.text_to_wav(text)
-                self.audio_cache[text] = audio_bytes
-        logger.info(f"已为 {len(self.audio_cache)} 句唯一文本生成音频。")
+        # 同一句话可能在对话中出现多次，先去重，再排除重试前已缓存的文本
+        unique_texts = {turn["text"] for turn in self.my_turns}
+        pending_texts = list(unique_texts - self.audio_cache.keys())
+        if not pending_texts:
+            logger.info(f"{len(unique_texts)} 句唯一文本的音频均已在内存中，跳过预生成。")
+            await self._upload_audio_payloads({text: self.audio_cache[text][0] for text in unique_texts})
+            return
+
+        async def load_audio(text: str) -> Tuple[bytes | None, float]:
+            # 与其他语音题共用基类的合成路径：先查磁盘缓存（在线程中读写），再受 TTS_CONCURRENCY 限制调用TTS
+            audio_bytes = await self._get_tts_audio(text, {})
+            # 时长在准备阶段解析一次并随音频缓存，重试时无需再次解析WAV
+            return audio_bytes, self._get_wav_duration(audio_bytes)
+
+        # 各句音频互不依赖，并发合成
+        results = await asyncio.gather(*(load_audio(text) for text in pending_texts))
+        self.audio_cache.update(zip(pending_texts, results))
+        # 音频已转存到 self.audio_cache，合成任务表无需继续持有
+        self._cancel_tts_prefetch()
+        logger.info(f"{len(self.my_turns)} 个回合共 {len(unique_texts)} 句唯一文本，已为其中 {len(pending_texts)} 句新准备音频。")
+        # 所有音频一次性上传到页面，回合中只切换当前音频
+        await self._upload_audio_payloads({text: self.audio_cache[text][0] for text in unique_texts})
+
+    async def _turn_list_changed(self) -> bool:
+        """
+        检查上一轮准备后对话列表是否发生了增删或被整体替换。
+        只观察列表的直接子节点，回合进行中分数、高亮等变化不会使其失效。
+        """
+        try:
+            return await self.driver_service.page.locator(_LIST_BOX_SEL).evaluate(
+                "el => el.__aiTurnsDirty !== false", timeout=2000
+            )
+        except Exception:
+            return True
 
     async def _execute_and_evaluate_turns(self) -> float:
         logger.info("进入执行与评估阶段...")
         turn_scores = []
+        # 分数在后台等待，不阻塞下一回合的开始；(回合序号, 等待分数的任务)
+        score_tasks: list[tuple[int, asyncio.Task]] = []
+        page = self.driver_service.page
 
-        await self.driver_service.page.locator(".record-seat").click()
+        await self.record_seat_locator.click()
         logger.info("已点击总的“开始”按钮，对话流程开始。")
 
         for i, turn in enumerate(self.my_turns):
-            logger.info(f"--- 开始执行第 {i + 1}/{len(self.my_turns)} 回合 ---")
+            logger.info("--- 开始执行第 %d/%d 回合 ---", i + 1, len(self.my_turns))
             text = turn["text"]
             stable_turn_locator = turn["locator"]
-            audio_bytes = self.audio_cache[text]
-
-            duration = 0
-            with wave.open(BytesIO(audio_bytes), 'rb') as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                duration = frames / float(rate) if rate > 0 else 0
+            audio_bytes, duration = self.audio_cache[text]
 
             try:
-                active_turn_locator = self.driver_service.page.locator(".list-item-review.active").filter(has_text=text)
+                active_turn_locator = page.locator(_ACTIVE_TURN_SEL).filter(has_text=text)
                 await active_turn_locator.wait_for(timeout=30000)
 
-                pause_icon_selector = "svg.pause-circle-player path[d^='M464.54']"
-                await active_turn_locator.locator(pause_icon_selector).wait_for(timeout=5000)
-                logger.debug(f"检测到我方回合“{text}”已开始（出现暂停图标）。")
+                await active_turn_locator.locator(_PAUSE_ICON_SEL).wait_for(timeout=5000)
+                logger.debug("检测到我方回合“%s”已开始（出现暂停图标）。", text)
 
-                await self._set_persistent_audio_payload(audio_bytes)
+                if not await self._activate_audio_payload(text):
+                    await self._set_persistent_audio_payload(audio_bytes)
 
                 wait_time = duration + 0.5
-                logger.debug(f"音频时长 {duration:.2f}s，等待 {wait_time:.2f}s 模拟录音...")
-                await self.driver_service.page.wait_for_timeout(wait_time * 1000)
+                logger.debug("音频时长 %.2fs，等待 %.2fs 模拟录音...", duration, wait_time)
+                await asyncio.sleep(wait_time)
                 
-                await active_turn_locator.locator("svg.pause-circle-player.active").click()
-                logger.debug("已点击结束当前回合。")
-
-                logger.debug("正在等待分数更新...")
-                score = await self._wait_for_and_get_score(stable_turn_locator)
-                turn_scores.append(score)
-                logger.info(f"第 {i + 1} 回合得分: {score}")
+                await active_turn_locator.locator(_ACTIVE_PAUSE_BUTTON_SEL).click()
+                logger.debug("已点击结束当前回合，分数将在后台等待更新。")
+                score_tasks.append((i, asyncio.create_task(self._wait_for_and_get_score(stable_turn_locator))))
 
             except Exception as e:
                 logger.error(f"执行第 {i+1} 回合时发生错误: {e}")
                 turn_scores.append(0)
             finally:
+                # “信使”变量必须在下一回合设置新音频之前清理，因此这里仍然同步等待
                 await self._clear_persistent_audio_payload()
 
         logger.info("我方回合已全部完成，正在等待对话结束和最终按钮的出现...")
         # 直接等待最终按钮出现，并将超时增加到30秒，以覆盖AI最后一句的播放时间。
-        final_button_locator = self.driver_service.page.locator(".btn:has-text('提交'), .btn:has-text('提 交'), .btn:has-text('下一题')").first
-        await final_button_locator.wait_for(timeout=30000)
-        logger.info("检测到最终按钮（提交/下一题），本轮流程结束。")
+        final_button_locator = page.locator(_FINAL_BUTTON_SEL).first
+        try:
+            await final_button_locator.wait_for(timeout=30000)
+            logger.info("检测到最终按钮（提交/下一题），本轮流程结束。")
+
+            scores = await asyncio.gather(*(task for _, task in score_tasks))
+        finally:
+            # 等待最终按钮失败（或被取消）时，取消仍在等待分数的后台任务并回收，避免任务泄漏
+            pending_tasks = [task for _, task in score_tasks if not task.done()]
+            for task in pending_tasks:
+                task.cancel()
+            if pending_tasks:
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
+        for (i, _), score in zip(score_tasks, scores):
+            logger.info("第 %d 回合得分: %s", i + 1, score)
+        turn_scores.extend(scores)
 
         if not turn_scores:
             return 0.0
@@ -1,4 +1,6 @@
 import asyncio
+import json
+import re
 from playwright.async_api import Error as PlaywrightError
 
 from src import prompts, config
@@ -8,6 +10,15 @@ from src.services.driver_service import DriverService
 from src.strategies.base_strategy import BaseStrategy
 from src.utils import logger
 
+# 附加材料中由 DriverService._parse_table_to_markdown 生成的表格对齐行（如 "|:---:|:---:|"），用于识别表格题
+_TABLE_SEPARATOR_RE = re.compile(r"^\|:-+:\|", re.MULTILINE)
+
+# 页面选择器
+_INPUTBOX_SEL = ".question-inputbox"
+_SUB_QUESTION_HEADER_SEL = ".question-inputbox-header .component-htmlview"  # 相对于 _INPUTBOX_SEL
+_TEXTAREA_SEL = "textarea.question-inputbox-input"
+_ARTICLE_SEL = ".comp-common-article-content"
+_SUBMIT_SEL = ".btn"
 
 class ShortAnswerStrategy(BaseStrategy):
     """
@@ -21,7 +32,8 @@ class ShortAnswerStrategy(BaseStrategy):
     async def check(driver_service: DriverService) -> bool:
         """检查当前页面是否为简答题。"""
         try:
-            is_visible = await driver_service.page.locator(".question-inputbox").first.is_visible(timeout=2000)
+            # is_visible 不会等待元素出现（timeout 参数已被 Playwright 忽略），不匹配时立即返回
+            is_visible = await driver_service.page.locator(_INPUTBOX_SEL).first.is_visible()
             if is_visible:
                 logger.info("检测到简答题，应用简答题策略。")
                 return True
@@ -34,79 +46,35 @@ class ShortAnswerStrategy(BaseStrategy):
         logger.info("开始执行简答题策略...")
 
         try:
-            # 统一提取所有子问题题干和输入框数量
-            question_containers = await self.driver_service.page.locator(".question-inputbox").all()
-            num_answers_required = len(question_containers)
+            # 一次往返统一提取所有子问题题干，输入框数量即题干数量
+            sub_questions = await self.driver_service.page.locator(_INPUTBOX_SEL).evaluate_all("""
+                (els, headerSelector) => els.map(el => {
+                    const header = el.querySelector(headerSelector);
+                    return header ? (header.textContent || '').trim() : '';
+                })
+            """, _SUB_QUESTION_HEADER_SEL)
+            num_answers_required = len(sub_questions)
             
             # 如果没有找到输入框，可能不是预期的页面，提前退出
             if num_answers_required == 0:
                 logger.warning("在页面上未找到任何简答题输入框。")
                 return False, False
 
-            logger.info("正在并发提取文章、说明等信息...")
-            tasks = [
-                self._get_article_text(),
-                self.driver_service._extract_additional_material_for_ai()
-            ]
-            results = await asyncio.gather(*tasks)
-            article_text, additional_material = results
             direction_text = await self._get_direction_text()
-            logger.info("信息提取完毕。")
+            use_response_cache = config.AI_RESPONSE_CACHE_ENABLED and not config.FORCE_AI
 
-            full_context = f"{shared_context}\n{article_text}\n{additional_material}".strip()
-            is_table_question = "|:---:" in additional_material
-            
-            sub_questions = []
-            for container in question_containers:
-                sub_q_text = ""
-                try:
-                    content = await container.locator(".question-inputbox-header .component-htmlview").text_content(timeout=1000)
-                    if content:
-                        sub_q_text = content.strip()
-                except PlaywrightError:
-                    logger.warning("一个简答题的 header 为空，将视其题目内容为空字符串。")
-                sub_questions.append(sub_q_text)
-            
-            sub_questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(sub_questions) if q])
-            logger.info(f"提取到 {len(sub_questions)} 个简答题的题干。")
-
-            # 构造关于答案数量的明确指令
-            explicit_count_instruction = f"重要指令：页面上共有 {num_answers_required} 个回答框，你必须为每个回答框生成一个答案，总共生成 {num_answers_required} 个答案。"
-            # 将此明确指令附加到原有的方向说明中
-            final_direction_text = f"{direction_text}\n\n{explicit_count_instruction}"
-
-            if is_table_question:
-                logger.info("检测到表格题型，使用专用的表格Prompt。")
-                prompt = prompts.TABLE_SHORT_ANSWER_PROMPT.format(
-                    direction_text=final_direction_text,
-                    article_text=full_context,
-                    sub_questions=sub_questions_text
-                )
+            # 先用题干、说明、媒体地址等廉价信息查缓存，命中时可跳过转写音视频和构建Prompt
+            quick_cache_key, media, additional_material = await self._build_quick_cache_key(direction_text, sub_questions, shared_context)
+            json_data = self.cache_service.get_ai_response(quick_cache_key) if use_response_cache else None
+            if json_data:
+                logger.info("命中页面结构缓存，跳过材料提取和AI调用。")
             else:
-                logger.info("使用标准简答题Prompt。")
-                article_section = f"以下是文章或听力原文内容:\n{full_context}\n\n" if full_context else ""
-                prompt = prompts.SHORT_ANSWER_PROMPT.format(
-                    direction_text=final_direction_text,
-                    article_text=article_section,
-                    sub_questions=sub_questions_text
-                )
-
-            if not config.IS_AUTO_MODE:
-                logger.info("=" * 50)
-                logger.info("即将发送给 AI 的完整 Prompt 如下：")
-                logger.info(prompt)
-                logger.info("=" * 50)
-            
-            if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
-                confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
-                if confirm.strip().upper() not in ["Y", ""]:
-                    logger.warning("用户取消了 AI 调用，终止当前任务。")
+                json_data = await self._request_answers(sub_questions, direction_text, shared_context, use_response_cache,
+                                                        media, additional_material)
+                if json_data is None:
                     return False, False
-            
-            json_data = self.ai_service.get_chat_completion(prompt)
-            if not json_data or "answers" not in json_data or not isinstance(json_data["answers"], list):
-                logger.error("未能从AI获取有效的答案列表。")
-                return False, False
+                if config.AI_RESPONSE_CACHE_ENABLED:
+                    self.cache_service.save_ai_response(quick_cache_key, json_data)
 
             answers_to_fill = json_data["answers"]
             logger.info(f"AI已生成 {len(answers_to_fill)} 个回答。")
@@ -119,14 +87,119 @@ class ShortAnswerStrategy(BaseStrategy):
             logger.error(f"执行简答题策略时发生错误: {e}")
             return False, False
 
-    async def _get_article_text(self) -> str:
+    async def _build_quick_cache_key(self, direction_text: str, sub_questions: list[str],
+                                     shared_context: str) -> tuple[str, tuple[str | None, str | None], str]:
+        """
+        用无需转写、无需AI的廉价页面信息构造缓存键：页面面包屑、说明、各小题题干、媒体地址、文章原文、
+        附加材料（表格题的题目就在其中）及共享上下文。面包屑保证说明通用、题干为空的不同页面不会共用答案。
+        同时返回本次探测到的 (媒体地址, 媒体类型) 和附加材料，缓存未命中时直接用于构建Prompt。
+        """
+        breadcrumb_parts, media, additional_material = await asyncio.gather(
+            self.driver_service.get_breadcrumb_parts(),
+            self.driver_service.get_media_source_and_type(),
+            self.driver_service._extract_additional_material_for_ai()
+        )
+        media_url = media[0]
+        article_texts = [] if media_url else await self.driver_service.page.locator(_ARTICLE_SEL).all_text_contents()
+        quick_cache_key = "short_answer_page\n" + json.dumps(
+            [breadcrumb_parts, direction_text, sub_questions, media_url, article_texts, additional_material, shared_context],
+            ensure_ascii=False
+        )
+        return quick_cache_key, media, additional_material
+
+    async def _request_answers(self, sub_questions: list[str], direction_text: str, shared_context: str, use_response_cache: bool,
+                               media: tuple[str | None, str | None], additional_material: str) -> dict | None:
+        """提取文章、构建Prompt并获取AI答案；返回 None 表示应终止当前任务。"""
+        num_answers_required = len(sub_questions)
+        logger.info("正在提取文章材料...")
+        article_text = await self._get_article_text(*media)
+        logger.info("信息提取完毕。")
+
+        full_context = f"{shared_context}\n{article_text}\n{additional_material}".strip()
+        is_table_question = bool(_TABLE_SEPARATOR_RE.search(additional_material))
+        
+        empty_header_count = sub_questions.count("")
+        if empty_header_count:
+            logger.warning(f"{empty_header_count} 个简答题的 header 为空，将视其题目内容为空字符串。")
+        
+        sub_questions_text = "\n".join(f"{i}. {q}" for i, q in enumerate(sub_questions, 1) if q)
+        logger.info(f"提取到 {len(sub_questions)} 个简答题的题干。")
+
+        # 构造关于答案数量的明确指令
+        explicit_count_instruction = f"重要指令：页面上共有 {num_answers_required} 个回答框，你必须为每个回答框生成一个答案，总共生成 {num_answers_required} 个答案。"
+        # 将此明确指令附加到原有的方向说明中
+        final_direction_text = f"{direction_text}\n\n{explicit_count_instruction}"
+
+        if is_table_question:
+            logger.info("检测到表格题型，使用专用的表格Prompt。")
+            prompt = prompts.TABLE_SHORT_ANSWER_PROMPT.format(
+                direction_text=final_direction_text,
+                article_text=full_context,
+                sub_questions=sub_questions_text
+            )
+        else:
+            logger.info("使用标准简答题Prompt。")
+            article_section = f"以下是文章或听力原文内容:\n{full_context}\n\n" if full_context else ""
+            prompt = prompts.SHORT_ANSWER_PROMPT.format(
+                direction_text=final_direction_text,
+                article_text=article_section,
+                sub_questions=sub_questions_text
+            )
+
+        json_data = self.cache_service.get_ai_response(prompt) if use_response_cache else None
+        if json_data:
+            logger.info("命中相同Prompt的AI回答缓存，跳过AI调用。")
+        else:
+            if not config.IS_AUTO_MODE:
+                logger.info("=" * 50)
+                logger.info("即将发送给 AI 的完整 Prompt 如下：")
+                logger.info(prompt)
+                logger.info("=" * 50)
+
+            # 先开始等待所有输入框挂载：在用户确认和AI请求期间同时进行，回答返回后即可直接填写
+            textareas_ready = asyncio.create_task(self._wait_for_textareas(num_answers_required, timeout=10000))
+
+            if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
+                confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
+                if confirm.strip().upper() not in ["Y", ""]:
+                    textareas_ready.cancel()
+                    logger.warning("用户取消了 AI 调用，终止当前任务。")
+                    return None
+
+            # AI请求放到线程中执行
+            json_data, textareas_result = await asyncio.gather(
+                asyncio.to_thread(self.ai_service.get_chat_completion, prompt),
+                textareas_ready,
+                return_exceptions=True
+            )
+            if isinstance(json_data, BaseException):
+                raise json_data
+            if isinstance(textareas_result, PlaywrightError):
+                logger.warning(f"等待 {num_answers_required} 个输入框挂载超时，将在填写时再核对数量。")
+            if not json_data or "answers" not in json_data or not isinstance(json_data["answers"], list):
+                logger.error("未能从AI获取有效的答案列表。")
+                return None
+            if config.AI_RESPONSE_CACHE_ENABLED:
+                self.cache_service.save_ai_response(prompt, json_data)
+        return json_data
+
+    async def _get_article_text(self, media_url: str | None, media_type: str | None) -> str:
         try:
-            media_url, media_type = await self.driver_service.get_media_source_and_type()
+            # 媒体由构造缓存键时的本次探测结果传入，不按页面URL复用（题中题各子题共用同一URL但媒体不同）
             if media_url:
+                # “题中题”的各子题常共用同一段音视频，已转写过时直接复用
+                transcript = self.cache_service.get_transcript(media_url)
+                if transcript is not None:
+                    logger.info(f"复用已转写的 {media_type} 材料。")
+                    return transcript
                 logger.info(f"发现 {media_type} 文件，准备转写...")
-                return self.ai_service.transcribe_media_from_url(media_url)
+                # 下载与转写都是阻塞操作，放到线程中执行，避免卡住事件循环
+                transcript = await asyncio.to_thread(self.ai_service.transcribe_media_from_url, media_url)
+                if transcript:
+                    self.cache_service.save_transcript(media_url, transcript)
+                return transcript
             
-            article_locator = self.driver_service.page.locator(".comp-common-article-content")
+            article_locator = self.driver_service.page.locator(_ARTICLE_SEL)
             if await article_locator.is_visible(timeout=1000):
                 logger.info("发现文章容器，正在提取文本...")
                 return await article_locator.text_content()
@@ -135,21 +208,50 @@ class ShortAnswerStrategy(BaseStrategy):
         logger.info("未找到文章/媒体材料。")
         return ""
 
+    async def _wait_for_textareas(self, count: int, timeout: int = 5000):
+        """在页面内等待至少 count 个输入框挂载完成，由浏览器端轮询，无需Python侧反复查询。"""
+        await self.driver_service.page.wait_for_function(
+            "({ selector, count }) => document.querySelectorAll(selector).length >= count",
+            arg={"selector": _TEXTAREA_SEL, "count": count},
+            timeout=timeout
+        )
+
     async def _fill_and_submit(self, answers: list[str], is_chained_task: bool = False) -> tuple[bool, bool]:
         try:
-            textarea_locators = await self.driver_service.page.locator("textarea.question-inputbox-input").all()
+            try:
+                # 命中缓存时不会经过AI请求阶段的预等待，这里确保输入框已全部挂载；已挂载时立即返回
+                await self._wait_for_textareas(len(answers))
+            except PlaywrightError:
+                logger.warning(f"等待 {len(answers)} 个输入框挂载超时，将按当前数量核对。")
 
-            if len(answers) != len(textarea_locators):
-                logger.error(f"AI返回的答案数量 ({len(answers)}) 与页面输入框数量 ({len(textarea_locators)}) 不匹配，终止作答。")
+            logger.info("开始填写答案...")
+            # 一次往返写入全部输入框：通过原生 value setter 赋值并派发 input/change 事件，让页面框架同步状态。
+            # 写入后等待一帧渲染再回读，确认受控组件没有把值重置，取代固定的 sleep。
+            fill_result = await self.driver_service.page.evaluate("""async ({ selector, answers }) => {
+                const textareas = [...document.querySelectorAll(selector)];
+                if (textareas.length !== answers.length) return { count: textareas.length, unsettled: [] };
+                const setValue = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set;
+                textareas.forEach((textarea, i) => {
+                    setValue.call(textarea, answers[i]);
+                    textarea.dispatchEvent(new Event('input', { bubbles: true }));
+                    textarea.dispatchEvent(new Event('change', { bubbles: true }));
+                });
+                await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+                const unsettled = [];
+                textareas.forEach((textarea, i) => { if (textarea.value !== answers[i]) unsettled.push(i + 1); });
+                return { count: textareas.length, unsettled };
+            }""", {"selector": _TEXTAREA_SEL, "answers": answers})
+
+            textarea_count = fill_result["count"]
+            if len(answers) != textarea_count:
+                logger.error(f"AI返回的答案数量 ({len(answers)}) 与页面输入框数量 ({textarea_count}) 不匹配，终止作答。")
+                return False, False
+            if fill_result["unsettled"]:
+                logger.error(f"第 {fill_result['unsettled']} 题的输入框内容未能保持，终止作答。")
                 return False, False
 
-            logger.info("开始填写答案...")
-            for i, textarea_locator in enumerate(textarea_locators):
-                answer_text = answers[i]
+            for i, answer_text in enumerate(answers):
                 logger.info(f"第 {i+1} 题，填入: '{answer_text[:50]}...'")
-                await textarea_locator.fill(answer_text)
-                await asyncio.sleep(0.2)
-
             logger.success("答案填写完毕。")
 
             if not is_chained_task:
@@ -160,7 +262,7 @@ class ShortAnswerStrategy(BaseStrategy):
                         should_submit = False
                 
                 if should_submit:
-                    await self.driver_service.page.click(".btn")
+                    await self.driver_service.page.click(_SUBMIT_SEL)
                     await self.driver_service.handle_rate_limit_modal()
                     logger.info("答案已提交。正在处理最终确认弹窗...")
                     await self.driver_service.handle_submission_confirmation()
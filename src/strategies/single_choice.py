@@ -1,6 +1,4 @@
 import asyncio
-import re
-import html
 from playwright.async_api import Error as PlaywrightError
 
 from src import prompts, config
@@ -10,6 +8,12 @@ from src.services.driver_service import DriverService
 from src.strategies.base_strategy import BaseStrategy
 from src.utils import logger
 
+# 页面选择器
+_SINGLE_CHOICE_SEL = "div.question-common-abs-choice:not(.multipleChoice)"
+_OPTION_WRAP_SEL = ".option-wrap"
+_OPTION_SEL = ".option"
+_SUBMIT_SEL = ".btn"
+
 class SingleChoiceStrategy(BaseStrategy):
     """
     单选题的处理策略。
@@ -24,10 +28,15 @@ class SingleChoiceStrategy(BaseStrategy):
     async def check(driver_service: DriverService) -> bool:
        """检查当前页面是否为单选题。"""
        try:
-           is_question_wrap_visible = await driver_service.page.locator("div.question-common-abs-choice:not(.multipleChoice)").first.is_visible(timeout=2000)
-           is_option_wrap_visible = await driver_service.page.locator(".option-wrap").first.is_visible(timeout=2000)
+           # 一次往返同时检查题目容器与选项容器是否可见（is_visible 不会等待，其 timeout 参数并不生效）
+           is_single_choice = await driver_service.page.evaluate("""({ questionSelector, wrapSelector }) => {
+               const isVisible = (el) => !!el && el.getClientRects().length > 0
+                   && getComputedStyle(el).visibility !== 'hidden';
+               return isVisible(document.querySelector(questionSelector))
+                   && isVisible(document.querySelector(wrapSelector));
+           }""", {"questionSelector": _SINGLE_CHOICE_SEL, "wrapSelector": _OPTION_WRAP_SEL})
            
-           if is_question_wrap_visible and is_option_wrap_visible:
+           if is_single_choice:
                logger.info("页面初步符合[单选题]特征，应用单选题策略。")
                return True
            return False
@@ -39,9 +48,12 @@ class SingleChoiceStrategy(BaseStrategy):
         logger.info("开始执行单选题策略...")
 
         try:
-            base_breadcrumb_parts = await self.driver_service.get_breadcrumb_parts()
-            original_question_locators = await self.driver_service.page.locator(".question-common-abs-reply").all()
-            if not base_breadcrumb_parts or not original_question_locators:
+            # 题目数据由一次 evaluate 取回，后续的题目计数与缓存校验都复用它，不再单独查询题目容器
+            base_breadcrumb_parts, questions = await asyncio.gather(
+                self.driver_service.get_breadcrumb_parts(),
+                self._extract_questions_dom()
+            )
+            if not base_breadcrumb_parts or not questions:
                 logger.error("无法获取页面关键信息（面包屑或题目），终止策略。")
                 return False, False
         except Exception as e:
@@ -54,16 +66,30 @@ class SingleChoiceStrategy(BaseStrategy):
             current_breadcrumb_parts = base_breadcrumb_parts + [str(sub_task_index)]
             logger.info(f"题中题缓存路径：{' -> '.join(current_breadcrumb_parts)}")
 
+        question_texts = self._build_question_texts(questions)
+        question_keys = CacheService.make_question_keys(question_texts)
+
         cache_write_needed = False
         answers_to_fill = []
         use_cache = False
+        # 按题目键命中的部分答案；未命中的题目才交给AI
+        partial_answers: list[str | None] = [None] * len(question_texts)
 
         if not is_chained_task or sub_task_index != -1: # 只有非链式任务 或 链式任务的子任务才尝试从缓存读取
             task_page_cache = self.cache_service.get_task_page_cache(current_breadcrumb_parts)
             if not config.FORCE_AI and task_page_cache and task_page_cache.get('type') == self.strategy_type:
                 logger.info("在缓存中找到此页面的记录，正在校验...")
                 cached_answers = task_page_cache.get('answers', [])
-                if len(cached_answers) == len(original_question_locators):
+                question_answers = task_page_cache.get('question_answers')
+                if question_answers:
+                    partial_answers = [question_answers.get(key) for key in question_keys]
+                    if partial_answers and all(partial_answers):
+                        use_cache = True
+                        answers_to_fill = partial_answers
+                    else:
+                        hit_count = sum(1 for answer in partial_answers if answer)
+                        logger.warning(f"缓存命中 {hit_count}/{len(question_texts)} 题，其余题目将调用AI。")
+                elif len(cached_answers) == len(questions):
                     use_cache = True
                     answers_to_fill = cached_answers
                 else:
@@ -91,68 +117,110 @@ class SingleChoiceStrategy(BaseStrategy):
             article_text, direction_text, additional_material = results
             logger.info("信息提取完毕。")
 
-            question_texts = []
-            for qw_locator in original_question_locators:
-                title = await qw_locator.locator(".ques-title").text_content()
-                
-                options_text_parts = []
-                option_locators = await qw_locator.locator(".option").all()
-                for opt_loc in option_locators:
-                    caption = await opt_loc.locator(".caption").text_content()
-                    content_html = await opt_loc.locator(".content").inner_html()
-                    processed_content = re.sub(r'<span style="text-decoration: underline;">(.*?)</span>', r'*\1*', content_html, flags=re.IGNORECASE | re.DOTALL)
-                    processed_content = re.sub(r'<u>(.*?)</u>', r'*\1*', processed_content, flags=re.IGNORECASE | re.DOTALL)
-                    processed_content = re.sub(r'<.*?>', '', processed_content)
-                    processed_content = html.unescape(processed_content)
-                    
-                    options_text_parts.append(f"{caption.strip()}. {processed_content.strip()}")
-                
-                options_text = "\n".join(options_text_parts)
-                full_text = f"{title.strip()}\n{options_text}"
-                question_texts.append(full_text)
-
-            full_questions_and_options_text = "\n\n".join(question_texts)
+            missing_indices = [i for i, answer in enumerate(partial_answers) if not answer]
+            full_questions_and_options_text = "\n\n".join(question_texts[i] for i in missing_indices)
             combined_context = f"{shared_context}\n{article_text}"
             
             article_section = f"以下是文章或听力原文内容:\n{combined_context}\n\n" if combined_context.strip() else ""
+            # 文章放在说明之前：题中题的各子题共享同一篇文章，请求前缀一致时可命中 DeepSeek 的上下文缓存
             prompt = (
                 f"{prompts.SINGLE_CHOICE_PROMPT}\n"
-                f"以下是题目的说明:\n{direction_text}\n\n"
                 f"{article_section}"
+                f"以下是题目的说明:\n{direction_text}\n\n"
                 f"{additional_material}\n"
                 f"以下是题目和选项:\n{full_questions_and_options_text}"
             )
-            
-            if not config.IS_AUTO_MODE:
-                logger.info("=" * 50)
-                logger.info("即将发送给 AI 的完整 Prompt 如下：")
-                logger.info(prompt)
-                logger.info("=" * 50)
-            
-            if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
-                confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
-                if confirm.strip().upper() not in ["Y", ""]:
-                    logger.warning("用户取消了 AI 调用，终止当前任务。")
-                    return False, False
-            
-            json_data = self.ai_service.get_chat_completion(prompt)
+
+            use_response_cache = config.AI_RESPONSE_CACHE_ENABLED and not config.FORCE_AI
+            json_data = self.cache_service.get_ai_response(prompt) if use_response_cache else None
+            from_response_cache = bool(json_data)
+            if from_response_cache:
+                logger.info("命中相同Prompt的AI回答缓存，跳过AI调用。")
+            else:
+                if not config.IS_AUTO_MODE:
+                    logger.info("=" * 50)
+                    logger.info("即将发送给 AI 的完整 Prompt 如下：")
+                    logger.info(prompt)
+                    logger.info("=" * 50)
+                
+                if not (config.IS_AUTO_MODE and config.AUTO_MODE_NO_CONFIRM):
+                    confirm = await asyncio.to_thread(input, "是否确认发送此 Prompt？[Y/n]: ")
+                    if confirm.strip().upper() not in ["Y", ""]:
+                        logger.warning("用户取消了 AI 调用，终止当前任务。")
+                        return False, False
+                
+                json_data = await asyncio.to_thread(self.ai_service.get_chat_completion, prompt)
             if not json_data or "questions" not in json_data:
                 logger.error("未能从AI获取有效答案，终止执行。")
                 return False, False
 
             logger.debug(f"AI回答: {json_data}")
-            answers_to_fill = [str(item["answer"]).upper() for item in json_data.get("questions", []) if "answer" in item]
+            ai_answers = [str(item["answer"]).upper() for item in json_data.get("questions", []) if "answer" in item]
+            if len(ai_answers) != len(missing_indices):
+                logger.error(f"AI返回的答案数量 ({len(ai_answers)}) 与待解答题目数量 ({len(missing_indices)}) 不匹配，终止执行。")
+                return False, False
+            if config.AI_RESPONSE_CACHE_ENABLED and not from_response_cache:
+                self.cache_service.save_ai_response(prompt, json_data)
+
+            answers_to_fill = list(partial_answers)
+            for i, answer in zip(missing_indices, ai_answers):
+                answers_to_fill[i] = answer
+
+        return await self._fill_and_submit(answers_to_fill, cache_write_needed, current_breadcrumb_parts,
+                                           is_chained_task=is_chained_task, question_keys=question_keys)
 
-        return await self._fill_and_submit(answers_to_fill, cache_write_needed, current_breadcrumb_parts, is_chained_task=is_chained_task)
+    @staticmethod
+    def _build_question_texts(questions: list[dict]) -> list[str]:
+        """将 _extract_questions_dom 的结果整理为发送给AI的题目文本（题干 + 选项）。"""
+        # 每道题单独成文（缓存按题目键匹配），题干与各选项一次 join 拼接
+        return [
+            "\n".join([
+                question["title"].strip(),
+                *(f"{option['caption'].strip()}. {option['content'].strip()}" for option in question["options"])
+            ])
+            for question in questions
+        ]
+
+    async def _extract_questions_dom(self) -> list[dict]:
+        """
+        一次 evaluate 读取全部题目的标题与选项，避免逐个元素往返浏览器。
+        选项内容在页面内完成清洗：带下划线的文本（<u> 或下划线样式的 span）标记为 *文本*，再取纯文本。
+        """
+        return await self.driver_service.page.evaluate("""({ selector, optionSelector }) => {
+            const toMarkedText = (content) => {
+                if (!content) return '';
+                const clone = content.cloneNode(true);
+                clone.querySelectorAll('u, span').forEach(el => {
+                    if (el.tagName === 'U' || el.style.textDecoration.includes('underline')) {
+                        el.replaceWith(`*${el.textContent}*`);
+                    }
+                });
+                return clone.textContent;
+            };
+            return [...document.querySelectorAll(selector)].map(question => ({
+                title: question.querySelector('.ques-title')?.textContent ?? '',
+                options: [...question.querySelectorAll(optionSelector)].map(option => ({
+                    caption: option.querySelector('.caption')?.textContent ?? '',
+                    content: toMarkedText(option.querySelector('.content'))
+                }))
+            }));
+        }""", {"selector": config.QUESTION_WRAP, "optionSelector": _OPTION_SEL})
 
     async def _get_article_text(self) -> str:
         media_url, media_type = await self.driver_service.get_media_source_and_type()
         if media_url:
+            article_text = self.cache_service.get_transcript(media_url)
+            if article_text:
+                logger.info(f"复用已缓存的 {media_type} 转写结果。")
+                return article_text
             logger.info(f"发现 {media_type} 文件，准备转写: {media_url}")
             try:
-                article_text = self.ai_service.transcribe_media_from_url(media_url)
+                # 下载与转写都是阻塞操作，放到线程中执行，与说明、附加材料的提取并发进行
+                article_text = await asyncio.to_thread(self.ai_service.transcribe_media_from_url, media_url)
                 if not article_text:
                     logger.warning("媒体文件转写失败。")
+                else:
+                    self.cache_service.save_transcript(media_url, article_text)
                 return article_text
             except Exception as e:
                 logger.error(f"媒体文件转写时发生错误: {e}")
@@ -160,35 +228,34 @@ class SingleChoiceStrategy(BaseStrategy):
         logger.info("未在本页找到可用的音频或视频文件。")
         return ""
 
-    async def _fill_and_submit(self, answers: list[str], cache_write_needed: bool, breadcrumb_parts: list[str], is_chained_task: bool = False) -> tuple[bool, bool]:
+    async def _fill_and_submit(self, answers: list[str], cache_write_needed: bool, breadcrumb_parts: list[str], is_chained_task: bool = False,
+                               question_keys: list[str] | None = None) -> tuple[bool, bool]:
         try:
             logger.debug("正在解析并预验证答案...")
-            option_wraps_locators = await self.driver_service.page.locator(".option-wrap").all()
+            answer_indices = [ord(answer_char) - ord("A") for answer_char in answers]
+            # 一次 evaluate 同时完成两件事：基于同一份DOM快照统计每题选项数量，
+            # 全部答案都在选项范围内时直接在页面内点击对应选项；否则不点击，由下方逐题报告原因
+            options_counts = await self.driver_service.page.evaluate("""({ wrapSelector, optionSelector, answerIndices }) => {
+                const optionLists = [...document.querySelectorAll(wrapSelector)].map(wrap => wrap.querySelectorAll(optionSelector));
+                const counts = optionLists.map(options => options.length);
+                const valid = counts.length === answerIndices.length
+                    && answerIndices.every((index, i) => index >= 0 && index < counts[i]);
+                if (valid) answerIndices.forEach((index, i) => optionLists[i][index].click());
+                return counts;
+            }""", {"wrapSelector": _OPTION_WRAP_SEL, "optionSelector": _OPTION_SEL, "answerIndices": answer_indices})
 
-            if len(answers) != len(option_wraps_locators):
-                logger.error(f"收到的答案数量 ({len(answers)}) 与页面题目数量 ({len(option_wraps_locators)}) 不匹配，为避免错位，已终止此题作答。")
+            if len(answers) != len(options_counts):
+                logger.error(f"收到的答案数量 ({len(answers)}) 与页面题目数量 ({len(options_counts)}) 不匹配，为避免错位，已终止此题作答。")
                 return False, False
 
-            is_valid = True
-            for i, option_wrap_locator in enumerate(option_wraps_locators):
+            for i, options_count in enumerate(options_counts):
                answer_char = answers[i]
-               options_count = await option_wrap_locator.locator(".option").count()
-               answer_index = ord(answer_char) - ord("A")
-               if not (0 <= answer_index < options_count):
+               if not (0 <= answer_indices[i] < options_count):
                    logger.error(f"第 {i+1} 题的答案 '{answer_char}' 无效（选项范围是 A-{chr(ord('A')+options_count-1)}），已终止此题作答。")
-                   is_valid = False
-                   break
-
-            if not is_valid:
-               return False, False
-
-            logger.info("预验证通过，开始填写答案...")
-            for i, option_wrap_locator in enumerate(option_wraps_locators):
-               answer_char = answers[i]
-               answer_index = ord(answer_char) - ord("A")
-               logger.info(f"第 {i+1} 题，选择选项: {answer_char}")
-               await option_wrap_locator.locator(".option").nth(answer_index).click()
+                   return False, False
 
+            for i, answer_char in enumerate(answers):
+               logger.info(f"第 {i+1} 题，已选择选项: {answer_char}")
             logger.success("答案填写完毕。")
 
             if not is_chained_task:
@@ -199,13 +266,13 @@ class SingleChoiceStrategy(BaseStrategy):
                         should_submit = False
                 
                 if should_submit:
-                    await self.driver_service.page.click(".btn")
+                    await self.driver_service.page.click(_SUBMIT_SEL)
                     await self.driver_service.handle_rate_limit_modal()
                     logger.info("答案已提交。正在处理最终确认弹窗...")
                     await self.driver_service.handle_submission_confirmation()
                     if cache_write_needed:
                         logger.info("准备从解析页面提取正确答案并写入缓存...")
-                        await self._write_answers_to_cache(breadcrumb_parts)
+                        await self._write_answers_to_cache(breadcrumb_parts, question_keys)
                     return True, cache_write_needed
                 else:
                     logger.warning("用户取消提交。")
@@ -217,7 +284,7 @@ class SingleChoiceStrategy(BaseStrategy):
             logger.error(f"填写或提交答案时出错: {e}")
             return False, False
 
-    async def _write_answers_to_cache(self, breadcrumb_parts: list[str]):
+    async def _write_answers_to_cache(self, breadcrumb_parts: list[str], question_keys: list[str] | None = None):
         try:
             await self.driver_service._navigate_to_answer_analysis_page()
             extracted_analysis_answers = await self.driver_service.extract_all_correct_answers_from_analysis_page()
@@ -229,7 +296,8 @@ class SingleChoiceStrategy(BaseStrategy):
             self.cache_service.save_task_page_answers(
                 breadcrumb_parts,
                 self.strategy_type,
-                extracted_analysis_answers
+                extracted_analysis_answers,
+                question_keys
             )
 
         except Exception as e:
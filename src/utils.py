@@ -1,5 +1,8 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from rich.console import Console
 from rich.logging import RichHandler
@@ -8,8 +11,9 @@ from rich.logging import RichHandler
 LOG_DIR = ".logs"
 os.makedirs(LOG_DIR, exist_ok=True) # 确保日志目录存在
 
+# 只写一份完整日志；需要仅看 INFO 及以上时按级别字段过滤即可（如 grep " - INFO - "），
+# 避免每条 INFO 记录被格式化并写入两个文件。
 DEBUG_LOG_FILE = os.path.join(LOG_DIR, "app_debug.log")
-INFO_LOG_FILE = os.path.join(LOG_DIR, "app_info.log")
 
 
 # 1. 创建一个 console 实例，并强制启用终端模式，以确保在 PyCharm 等环境中颜色正常显示。
@@ -29,62 +33,80 @@ rich_handler = RichHandler(
 rich_handler.setLevel(logging.INFO)
 
 # 3. 配置 FileHandler for DEBUG level
-debug_file_handler = logging.FileHandler(DEBUG_LOG_FILE, encoding='utf-8')
-debug_file_handler.setLevel(logging.DEBUG)
-debug_file_formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-debug_file_handler.setFormatter(debug_file_formatter)
-
-# 4. 配置 FileHandler for INFO level
-info_file_handler = logging.FileHandler(INFO_LOG_FILE, encoding='utf-8')
-info_file_handler.setLevel(logging.INFO)
-info_file_formatter = logging.Formatter(
+file_formatter = logging.Formatter(
     "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
-info_file_handler.setFormatter(info_file_formatter)
+debug_file_handler = logging.FileHandler(DEBUG_LOG_FILE, encoding='utf-8')
+debug_file_handler.setLevel(logging.DEBUG)
+debug_file_handler.setFormatter(file_formatter)
 
-# 5. 获取根记录器并添加所有处理程序
+# 4. 获取根记录器并添加所有处理程序
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.DEBUG) # 设置根记录器级别为DEBUG，以捕获所有消息
 
-# 清除basicConfig可能添加的默认handler，以避免重复
+# 本模块若被重复执行（如以不同路径导入或 importlib.reload），只保留最后一套处理程序，
+# 避免每条日志被多个 RichHandler/FileHandler 重复格式化和写入。
+# 同时清除basicConfig可能添加的默认handler，以避免重复
 if root_logger.handlers:
     for handler_to_remove in root_logger.handlers[:]:
         root_logger.removeHandler(handler_to_remove)
+        handler_to_remove.close() # 释放旧 FileHandler 持有的文件句柄
+
+# 文件写入交给后台 QueueListener 线程完成，事件循环线程每条日志只需一次内存入队，
+# 不会因磁盘 I/O 阻塞 Playwright 协程。
+# RichHandler 仍直接挂在根记录器上：控制台输出需与 main.py 的进度条保持同步顺序，
+# 且 QueueHandler 入队前会把异常信息转成文本，直接挂载才能保留 rich_tracebacks 的高亮回溯。
+# 模块被重复执行时，先停止上一轮的后台监听线程并关闭其文件处理程序，避免线程和文件句柄泄漏
+_previous_listener = globals().get("file_log_listener")
+if _previous_listener is not None:
+    _previous_listener.stop()
+    atexit.unregister(_previous_listener.stop)
+    for previous_handler in _previous_listener.handlers:
+        previous_handler.close()
+
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+file_log_listener = QueueListener(
+    log_queue,
+    debug_file_handler,
+    respect_handler_level=True
+)
+file_log_listener.start()
+atexit.register(file_log_listener.stop) # 退出前排空队列，确保日志完整落盘
 
 root_logger.addHandler(rich_handler)
-root_logger.addHandler(debug_file_handler)
-root_logger.addHandler(info_file_handler)
+root_logger.addHandler(queue_handler)
 
-# 6. 获取一个名为当前模块的 logger 实例
+# 5. 获取一个名为当前模块的 logger 实例
 _logger = logging.getLogger(__name__)
 
-# 7. 创建一个适配器类，以保持与旧的自定义 Logger 类的方法签名和行为兼容。
+# 6. 创建一个适配器类，以保持与旧的自定义 Logger 类的方法签名和行为兼容。
 #    这避免了在所有策略文件中重构 logger 调用的需要。
+#    debug/info 额外支持 %-风格参数（如 logger.debug("耗时 %.2fs", t)），
+#    格式化会推迟到确有处理程序需要输出时才进行，适合在高频循环中使用。
+#    warning/error/success 同样以 "%s" 模板传参，记录被过滤时不会拼接字符串。
 class LoggerAdapter:
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """记录调试信息。"""
-        _logger.debug(message)
+        _logger.debug(message, *args)
 
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """记录普通信息。"""
         # 移除旧的条件检查，因为 RichHandler 会自动处理与进度条的冲突。
-        _logger.info(message)
+        _logger.info(message, *args)
 
     def warning(self, message: str):
         """记录警告信息。RichHandler 会自动将其着色为黄色。"""
-        _logger.warning(f"{message}")
+        _logger.warning("%s", message)
 
     def error(self, message: str):
         """记录错误信息。RichHandler 会自动将其着色为红色。"""
-        _logger.error(f"{message}")
+        _logger.error("%s", message)
     
     def success(self, message: str):
         """记录成功信息，使用 rich 的标记语法实现绿色文本。"""
-        _logger.info(f"[green]{message}[/green]")
+        _logger.info("[green]%s[/green]", message)
 
     def always_print(self, message: str):
         """
@@ -93,5 +115,5 @@ class LoggerAdapter:
         """
         _logger.info(message)
 
-# 8. 创建一个全局的 logger 单例，供整个应用程序导入和使用。
+# 7. 创建一个全局的 logger 单例，供整个应用程序导入和使用。
 logger = LoggerAdapter()
\ No newline at end of file
@@ -0,0 +1,25 @@
+import unittest
+
+
+class CleanTtsTextTests(unittest.TestCase):
+    def test_special_punctuation_is_replaced(self):
+        from src.services.ai_service import _clean_tts_text
+
+        self.assertEqual(
+            _clean_tts_text("“Wait”—she said… ‘ok’ 《Book》"),
+            "\"Wait\"-she said... 'ok' \"Book\"",
+        )
+
+    def test_full_width_characters_are_normalized(self):
+        from src.services.ai_service import _clean_tts_text
+
+        self.assertEqual(_clean_tts_text("Ｈｅｌｌｏ，ｗｏｒｌｄ！"), "Hello,world!")
+
+    def test_disallowed_characters_and_extra_whitespace_are_removed(self):
+        from src.services.ai_service import _clean_tts_text
+
+        self.assertEqual(_clean_tts_text("  Hi 你好\tthere  @#  friend \n"), "Hi there friend")
+
+
+if __name__ == "__main__":
+    unittest.main()
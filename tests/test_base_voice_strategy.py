@@ -0,0 +1,46 @@
+import io
+import unittest
+import wave
+
+
+def _make_wav(frame_count: int, framerate: int = 22050, channels: int = 1, sampwidth: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sampwidth)
+        wf.setframerate(framerate)
+        wf.writeframes(b"\x00" * frame_count * channels * sampwidth)
+    return buffer.getvalue()
+
+
+class WavDurationTests(unittest.TestCase):
+    def test_header_fast_path_matches_wave_module(self):
+        from src.strategies.base_voice_strategy import BaseVoiceStrategy
+
+        for frame_count, framerate, channels in [(22050, 22050, 1), (33075, 22050, 1), (16000, 16000, 2)]:
+            audio_bytes = _make_wav(frame_count, framerate, channels)
+            with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+                expected = wf.getnframes() / float(wf.getframerate())
+
+            self.assertAlmostEqual(BaseVoiceStrategy._get_wav_duration(audio_bytes), expected)
+
+    def test_non_standard_header_falls_back_to_wave_module(self):
+        from src.strategies.base_voice_strategy import BaseVoiceStrategy
+
+        audio_bytes = _make_wav(11025)
+        # 在 fmt 与 data 之间插入一个 LIST 块，头部不再是标准的44字节布局
+        list_chunk = b"LIST" + (4).to_bytes(4, "little") + b"INFO"
+        patched = bytearray(audio_bytes[:36] + list_chunk + audio_bytes[36:])
+        patched[4:8] = (len(patched) - 8).to_bytes(4, "little")
+
+        self.assertAlmostEqual(BaseVoiceStrategy._get_wav_duration(bytes(patched)), 0.5)
+
+    def test_empty_audio_has_zero_duration(self):
+        from src.strategies.base_voice_strategy import BaseVoiceStrategy
+
+        self.assertEqual(BaseVoiceStrategy._get_wav_duration(None), 0.0)
+        self.assertEqual(BaseVoiceStrategy._get_wav_duration(b""), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
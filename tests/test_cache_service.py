@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+
+class CacheServiceTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmpdir.name
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _make_service(self):
+        from src.services.cache_service import CacheService
+
+        return CacheService(
+            cache_file_path=os.path.join(self.tmpdir, "answer_cache.json"),
+            audio_cache_dir=os.path.join(self.tmpdir, "tts_cache"),
+            ai_response_cache_file=os.path.join(self.tmpdir, "ai_response_cache.json"),
+            transcript_cache_file=os.path.join(self.tmpdir, "transcript_cache.json"),
+        )
+
+    def test_audio_round_trip_and_key_depends_on_tts_params(self):
+        from src.services.cache_service import CacheService
+
+        service = self._make_service()
+        key = CacheService.make_audio_key("Hello.", length_scale=1.0)
+        service.put_audio(key, b"RIFF-data")
+
+        self.assertEqual(service.get_audio(key), b"RIFF-data")
+        self.assertIsNone(service.get_audio(CacheService.make_audio_key("Hello.", length_scale=1.2)))
+        self.assertEqual(key, CacheService.make_audio_key(" Hello. ", length_scale=1.0))
+
+    def test_ai_responses_round_trip_through_disk(self):
+        service = self._make_service()
+        service.save_ai_response("prompt", {"answers": ["x"]})
+
+        reloaded = self._make_service()
+
+        self.assertEqual(reloaded.get_ai_response("prompt"), {"answers": ["x"]})
+        self.assertIsNone(reloaded.get_ai_response("other prompt"))
+
+    def test_task_page_answers_round_trip_through_disk(self):
+        service = self._make_service()
+        service.save_task_page_answers(["Unit 1", "Listening"], "single_choice", ["A", "B"])
+
+        cached = self._make_service().get_task_page_cache(["Unit 1", "Listening"])
+
+        self.assertEqual(cached["type"], "single_choice")
+        self.assertEqual(cached["answers"], ["A", "B"])
+        self.assertNotIn("question_answers", cached)
+
+    def test_question_answers_are_looked_up_by_question_key(self):
+        from src.services.cache_service import CacheService
+
+        keys = CacheService.make_question_keys(["Q1\nA. x\nB. y", "Q2\nA. x\nB. y"])
+        service = self._make_service()
+        service.save_task_page_answers(["Unit 1"], "single_choice", ["A", "B"], keys)
+
+        question_answers = self._make_service().get_task_page_cache(["Unit 1"])["question_answers"]
+        reordered_keys = CacheService.make_question_keys(["Q2\nA. x\nB. y", "Q1\nA. x\nB. y"])
+
+        self.assertEqual([question_answers.get(key) for key in reordered_keys], ["B", "A"])
+
+    def test_duplicate_questions_keep_their_own_answers(self):
+        from src.services.cache_service import CacheService
+
+        texts = ["\nA. True\nB. False", "\nA. True\nB. False", "\nA. True\nB. False"]
+        keys = CacheService.make_question_keys(texts)
+        service = self._make_service()
+        service.save_task_page_answers(["Unit 1"], "single_choice", ["A", "B", "A"], keys)
+
+        question_answers = service.get_task_page_cache(["Unit 1"])["question_answers"]
+
+        self.assertEqual(len(set(keys)), 3)
+        self.assertEqual([question_answers[key] for key in keys], ["A", "B", "A"])
+
+    def test_mismatched_question_keys_drop_stale_question_answers(self):
+        from src.services.cache_service import CacheService
+
+        keys = CacheService.make_question_keys(["Q1", "Q2"])
+        service = self._make_service()
+        service.save_task_page_answers(["Unit 1"], "single_choice", ["A", "B"], keys)
+        service.save_task_page_answers(["Unit 1"], "single_choice", ["C", "D", "A"], keys)
+
+        cached = service.get_task_page_cache(["Unit 1"])
+
+        self.assertEqual(cached["answers"], ["C", "D", "A"])
+        self.assertNotIn("question_answers", cached)
+
+    def test_transcripts_ignore_query_string_and_fragment(self):
+        service = self._make_service()
+        service.save_transcript("https://cdn.example.com/a.mp3?sign=1&t=2#start", "hello")
+
+        reloaded = self._make_service()
+
+        self.assertEqual(reloaded.get_transcript("https://cdn.example.com/a.mp3?sign=9"), "hello")
+        self.assertIsNone(reloaded.get_transcript("https://cdn.example.com/b.mp3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
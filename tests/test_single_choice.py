@@ -0,0 +1,20 @@
+import unittest
+
+
+class SingleChoiceQuestionTextTests(unittest.TestCase):
+    def test_question_text_joins_title_and_options(self):
+        from src.strategies.single_choice import SingleChoiceStrategy
+
+        texts = SingleChoiceStrategy._build_question_texts([
+            {"title": " What is it? ", "options": [
+                {"caption": "A", "content": " A cat "},
+                {"caption": "B", "content": "A dog"},
+            ]},
+            {"title": "", "options": []},
+        ])
+
+        self.assertEqual(texts, ["What is it?\nA. A cat\nB. A dog", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()